@@ -12,7 +12,7 @@ import pygame
 
 from qplayer_config import *
 # from renderer import Renderer
-from video_handler import VideoHandler, VideoData, VideoStatus
+from video_handler import DECODE_DOWNSCALE, LoadPriority, VideoHandler, VideoData, VideoStatus
 
 CUE_EVENT = pygame.USEREVENT + 3
 
@@ -64,6 +64,8 @@ class ActiveCue:
         self.dmx_hold_until: float = 0.0
         self.dmx_latched_color: tuple[float, float, float] = (1.0, 1.0, 1.0)
         self.dmx_latched_layer_alpha: float = 1.0
+        # Cues sharing this cue's video_data (including itself); see CueEngine.join_shared.
+        self.share_group: Optional[list[ActiveCue]] = None
 
     def pause(self):
         self.paused = True
@@ -79,10 +81,33 @@ class ActiveCue:
             return
 
         start_time = time.time() if now is None else now
+        # The media clock runs from the moment the first frame can actually be shown.
+        self.cue_start_time = start_time
         if self.paused:
             self.pause_time = start_time
         self.playback_clock_started = True
 
+    def playback_elapsed(self, now: Optional[float] = None) -> float:
+        if not self.playback_clock_started:
+            return 0.0
+
+        if self.paused:
+            elapsed = self.pause_time - self.cue_start_time
+        else:
+            elapsed = (time.time() if now is None else now) - self.cue_start_time
+        return max(0.0, elapsed)
+
+    def media_time(self, video_data: Optional[VideoData] = None, now: Optional[float] = None) -> float:
+        video_data = self.video_data if video_data is None else video_data
+        return video_data.seek_start_seconds + self.playback_elapsed(now)
+
+    def frame_stats(self) -> dict[str, int]:
+        # Dropped/late/repeated frames of the video and its matte together.
+        stats = self.video_data.frame_stats()
+        for key, count in self.alpha_video_data.frame_stats().items():
+            stats[key] += count
+        return stats
+
     def position(self):
         if (
             self.video_data.status == VideoStatus.READY
@@ -98,14 +123,26 @@ class ActiveCue:
                 else:
                     return self.media_fadeIn
             else:
-                pts = self.video_data.current_frame.pts
-                time_base = self.video_data.current_frame.time_base
-                if pts is not None and time_base is not None:
-                    return float(pts * time_base)
+                return self.media_time()
 
         return 0.0
 
 
+class StandbyMedia:
+    def __init__(self, cue: VideoCue, key: tuple):
+        self.qid = str(cue.qid)
+        self.key = key
+        self.video_data = VideoData()
+        self.alpha_video_data = VideoData()
+
+    def release(self):
+        self.video_data.release()
+        self.alpha_video_data.release()
+
+    def memory_bytes(self) -> int:
+        return self.video_data.memory_bytes() + self.alpha_video_data.memory_bytes()
+
+
 class CueEngine:
     def __init__(
         self,
@@ -145,6 +182,19 @@ class CueEngine:
         )
         self.base_path = base_path
         self.profile_enabled = profile_enabled
+        # Look-ahead standby: media for the next few VideoCues is loaded and uploaded
+        # ahead of time so "go next" shows its first frame immediately.
+        self.preload_count = max(0, int(os.environ.get("PYPLAY_PRELOAD_COUNT", "2")))
+        self.preload_budget_bytes = int(
+            max(0.0, float(os.environ.get("PYPLAY_PRELOAD_BUDGET_MB", "512"))) * 1024 * 1024
+        )
+        self.standby: dict[str, StandbyMedia] = {}
+        # Cues showing the same stream share one decoder and texture set. A cue can join
+        # another's stream only if that one started playing less than this long ago.
+        self.share_join_seconds = max(
+            0.0, float(os.environ.get("PYPLAY_SHARE_JOIN_MS", "100"))
+        ) / 1000.0
+        self.shared_media: dict[tuple, list[ActiveCue]] = {}
 
         self.set_cues(cues)
 
@@ -176,6 +226,7 @@ class CueEngine:
         self.active_cues.sort(
             key=lambda obj: (obj.z_index, getattr(obj, "cue_order", 0))
         )
+        self.update_standby()
 
     def refresh_active_cues_from_definitions(self):
         for active_cue in self.active_cues:
@@ -296,6 +347,8 @@ class CueEngine:
     def pause(self, cue_id: str):
         match = next((q for q in self.active_cues if q.qid == cue_id), None)
         if match:
+            # The other cues sharing its stream keep playing.
+            self.detach_shared(match)
             match.pause()
 
     def unpause(self, cue_id: str):
@@ -340,11 +393,13 @@ class CueEngine:
                 match.media_loopCount = cue.loopCount
 
                 if isinstance(cue, VideoCue):
-                    match.video_data.seek_start_seconds = (
-                        cue.startTime.total_seconds() if cue.startTime else 0
-                    )
-                    match.video_data.seek_start()
-                    match.alpha_video_data.seek_start()
+                    start_seconds = cue.startTime.total_seconds() if cue.startTime else 0
+                    # A shared stream can't seek for just one cue; that cue restarts on its own.
+                    if not self.detach_shared(match, start_seconds):
+                        match.video_data.seek_start_seconds = start_seconds
+                        match.alpha_video_data.seek_start_seconds = start_seconds
+                        match.video_data.seek_start()
+                        match.alpha_video_data.seek_start()
 
                     match.cue_start_time = time.time()
                     match.playback_clock_started = False
@@ -428,6 +483,112 @@ class CueEngine:
                         cue.loopCount,
                     )
 
+        self.update_standby()
+
+    def standby_key(self, cue: VideoCue) -> tuple:
+        return (
+            self.resolve_path(cue.path),
+            self.resolve_path(cue.alphaPath) if cue.alphaPath else None,
+            cue.startTime.total_seconds() if cue.startTime else 0.0,
+            self.decode_size(cue),
+            cue.alphaPacking,
+        )
+
+    def decode_size(self, cue: VideoCue) -> Optional[tuple[int, int]]:
+        # Size the cue's video needs to be decoded at, or None for full resolution.
+        enabled = DECODE_DOWNSCALE if cue.decodeScale is None else bool(cue.decodeScale)
+        if not enabled or self.renderer is None:
+            return None
+        # A cue scale under 1 magnifies the video, so it needs proportionally more pixels.
+        scale = float(cue.scale or 1.0)
+        zoom = 1.0 / scale if 0.0 < scale < 1.0 else 1.0
+        width, height = self.renderer.scene_size
+        return (int(np.ceil(width * zoom)), int(np.ceil(height * zoom)))
+
+    def upcoming_video_cues(self) -> list[VideoCue]:
+        upcoming: list[VideoCue] = []
+        if self.preload_count <= 0 or not self.qid_list:
+            return upcoming
+
+        active_qids = {active_cue.qid for active_cue in self.active_cues}
+        for offset in range(1, len(self.qid_list) + 1):
+            qid = self.qid_list[(self.last_cue + offset) % len(self.qid_list)]
+            cue = self.cues.get(qid)
+            if isinstance(cue, VideoCue) and cue.path and qid not in active_qids:
+                upcoming.append(cue)
+                if len(upcoming) >= self.preload_count:
+                    break
+        return upcoming
+
+    def update_standby(self):
+        wanted = {str(cue.qid): cue for cue in self.upcoming_video_cues()}
+
+        for qid in list(self.standby):
+            entry = self.standby[qid]
+            cue = wanted.get(qid)
+            if cue is None or entry.key != self.standby_key(cue):
+                entry.release()
+                del self.standby[qid]
+
+        used_bytes = sum(entry.memory_bytes() for entry in self.standby.values())
+        for qid, cue in wanted.items():
+            if qid in self.standby:
+                continue
+            if used_bytes >= self.preload_budget_bytes:
+                break
+
+            entry = StandbyMedia(cue, self.standby_key(cue))
+            entry.video_data.seek_start_seconds = entry.key[2]
+            self.load_media_pair(
+                entry.key, entry.video_data, entry.alpha_video_data, LoadPriority.PRELOAD
+            )
+            self.standby[qid] = entry
+
+    def tick_standby(self):
+        if not self.standby or self.renderer is None:
+            return
+
+        # Keep within the memory budget, dropping the furthest-ahead cues first.
+        order = {str(cue.qid): i for i, cue in enumerate(self.upcoming_video_cues())}
+        entries = sorted(self.standby.values(), key=lambda e: order.get(e.qid, len(order)))
+        used_bytes = 0
+        for entry in entries:
+            used_bytes += entry.memory_bytes()
+            if used_bytes > self.preload_budget_bytes and entry is not entries[0]:
+                if self.profile_enabled:
+                    print(f"[Standby] Over budget, dropping qid={entry.qid}")
+                entry.release()
+                del self.standby[entry.qid]
+
+        # Upload at most one standby video per tick to keep frame times even.
+        for entry in entries:
+            if entry.qid not in self.standby:
+                continue
+            for video_data in (entry.video_data, entry.alpha_video_data):
+                if video_data.status in (VideoStatus.LOADED, VideoStatus.UPLOADING):
+                    self.renderer.prepare_textures(video_data)
+                    return
+
+    def take_standby(self, active_cue: ActiveCue, cue: VideoCue) -> bool:
+        entry = self.standby.pop(str(cue.qid), None)
+        if entry is None:
+            return False
+        if entry.key != self.standby_key(cue):
+            entry.release()
+            return False
+
+        for video_data in (entry.video_data, entry.alpha_video_data):
+            if video_data.load_job is not None:
+                self.video_handler.loader_pool.promote(video_data.load_job, LoadPriority.SHOW)
+        active_cue.video_data = entry.video_data
+        active_cue.alpha_video_data = entry.alpha_video_data
+        if self.profile_enabled:
+            print(
+                f"[Standby] Using preloaded media for qid={entry.qid} "
+                f"video_state={entry.video_data.status.name}"
+            )
+        return True
+
     def begin_new_playback(self, cue: CueUnion, paused: bool = False):
         active_cue = ActiveCue(cue)
         active_cue.cue_order = self.qid_order.get(str(cue.qid), 0)
@@ -464,11 +625,8 @@ class CueEngine:
             self.apply_initial_video_shader_parameters(active_cue, cue)
             self.arm_dmx_startup_hold(active_cue, active_cue.cue_start_time)
 
-            self.video_handler.load_video_async(self.resolve_path(cue.path), active_cue.video_data)
-            if cue.alphaPath:
-                self.video_handler.load_video_async(
-                    self.resolve_path(cue.alphaPath), active_cue.alpha_video_data
-                )
+            if not self.join_shared(active_cue, cue) and not self.take_standby(active_cue, cue):
+                self.load_cue_media(active_cue, cue)
         elif isinstance(cue, ShaderParams):
             if cue.videoQid == "post":
                 old = self.renderer.get_post_parameters()
@@ -490,6 +648,105 @@ class CueEngine:
 
         pygame.event.post(pygame.event.Event(CUE_EVENT, data=active_cue))
 
+    def load_cue_media(self, active_cue: ActiveCue, cue: VideoCue):
+        self.load_media_pair(
+            self.standby_key(cue), active_cue.video_data, active_cue.alpha_video_data
+        )
+
+    def load_media_pair(
+        self,
+        key: tuple,
+        video_data: VideoData,
+        alpha_video_data: VideoData,
+        priority: LoadPriority = LoadPriority.SHOW,
+    ):
+        path, alpha_path, _, decode_size, packing = key
+        # The matte is presented in lock-step with the video, so it plays from the same time.
+        alpha_video_data.seek_start_seconds = video_data.seek_start_seconds
+        if packing in (AlphaPacking.SideBySide, AlphaPacking.Stacked):
+            # One decoder: the renderer splits each frame between the two VideoData.
+            video_data.alpha_packing = packing
+            video_data.packed_matte = alpha_video_data
+            alpha_video_data.still = True
+            alpha_video_data.status = VideoStatus.LOADING
+            if decode_size is not None:
+                width, height = decode_size
+                decode_size = (width * 2, height) if packing == AlphaPacking.SideBySide else (width, height * 2)
+            self.video_handler.load_video_async(path, video_data, priority, decode_size)
+            return
+
+        self.video_handler.load_video_async(path, video_data, priority, decode_size)
+        if alpha_path:
+            self.video_handler.load_video_async(alpha_path, alpha_video_data, priority, decode_size)
+
+    def share_key(self, cue: VideoCue) -> tuple:
+        return self.standby_key(cue) + (cue.loopMode, cue.loopCount)
+
+    @staticmethod
+    def media_owner(group: Optional[list[ActiveCue]]) -> Optional[ActiveCue]:
+        # The cue whose clock drives a shared stream: the first one still playing normally.
+        if not group:
+            return None
+        live = [member for member in group if not member.complete]
+        return next((member for member in live if not member.endLoop), live[0] if live else None)
+
+    def owns_media(self, active_cue: ActiveCue) -> bool:
+        return self.media_owner(active_cue.share_group) in (None, active_cue)
+
+    def join_shared(self, active_cue: ActiveCue, cue: VideoCue) -> bool:
+        for key in [key for key, group in self.shared_media.items() if self.media_owner(group) is None]:
+            del self.shared_media[key]
+
+        key = self.share_key(cue)
+        group = self.shared_media.get(key)
+        owner = self.media_owner(group)
+        if (
+            owner is None
+            or active_cue.paused
+            or owner.paused
+            or owner.endLoop
+            or owner.video_data.status == VideoStatus.EMPTY
+            or owner.playback_elapsed() > self.share_join_seconds
+        ):
+            active_cue.share_group = [active_cue]
+            self.shared_media[key] = active_cue.share_group
+            return False
+
+        active_cue.video_data = owner.video_data.retain()
+        active_cue.alpha_video_data = owner.alpha_video_data.retain()
+        active_cue.cue_start_time = owner.cue_start_time
+        active_cue.playback_clock_started = owner.playback_clock_started
+        active_cue.share_group = group
+        group.append(active_cue)
+        if self.profile_enabled:
+            print(
+                f"[SharedMedia] qid={active_cue.qid} shares qid={owner.qid}'s stream "
+                f"consumers={len(group)} path={key[0]}"
+            )
+        return True
+
+    def detach_shared(self, active_cue: ActiveCue, start_seconds: Optional[float] = None) -> bool:
+        # Give a cue its own copy of a shared stream, so it can pause or seek alone.
+        group = active_cue.share_group
+        if group is None or sum(1 for member in group if not member.complete) <= 1:
+            return False
+
+        if start_seconds is None:
+            start_seconds = active_cue.media_time()
+        group.remove(active_cue)
+        active_cue.share_group = [active_cue]
+        active_cue.video_data.release()
+        active_cue.alpha_video_data.release()
+        active_cue.video_data = VideoData()
+        active_cue.alpha_video_data = VideoData()
+        active_cue.video_data.seek_start_seconds = start_seconds
+        active_cue.alpha_video_data.seek_start_seconds = start_seconds
+        active_cue.playback_clock_started = False
+        self.load_cue_media(active_cue, active_cue.cue)
+        if self.profile_enabled:
+            print(f"[SharedMedia] qid={active_cue.qid} detached, reloading at {start_seconds:.3f}s")
+        return True
+
     @staticmethod
     def resolve_video_cue_duration(cue: VideoCue) -> Optional[timedelta]:
         if cue.playbackDuration is not None:
@@ -534,7 +791,16 @@ class CueEngine:
             and (self._dmx_trace_counter % self.dmx_trace_every) == 0
         )
 
+        self.tick_standby()
+
         for active_cue in self.active_cues:
+            owner = self.media_owner(active_cue.share_group)
+            if owner not in (None, active_cue) and not active_cue.endLoop and owner.playback_clock_started:
+                # Followers of a shared stream run on its owner's clock.
+                active_cue.cue_start_time = owner.cue_start_time
+                active_cue.loop_counter = owner.loop_counter
+                active_cue.playback_clock_started = True
+
             if isinstance(active_cue.cue, VideoCue) and not active_cue.playback_clock_started:
                 active_cue.alpha = 0.0
                 continue
@@ -594,7 +860,7 @@ class CueEngine:
                     duration = 10000000                  # If hold last frame, pretend video is very long
 
                 # Check if we are looping
-                if (
+                looping = (
                     not active_cue.endLoop and
                     (
                         active_cue.media_loopMode == LoopMode.LoopedInfinite or  # looping forever?
@@ -603,13 +869,25 @@ class CueEngine:
                             active_cue.media_loopCount > (active_cue.loop_counter + 1)
                         )
                     )
-                ):
+                )
+                if isinstance(active_cue.cue, VideoCue) and self.owns_media(active_cue):
+                    # Let the decoders preroll the loop head before this pass ends.
+                    loop_length = duration if 0.0 < duration < 10000000 else None
+                    for video_data in (active_cue.video_data, active_cue.alpha_video_data):
+                        video_data.set_loop(
+                            looping,
+                            None if loop_length is None else video_data.seek_start_seconds + loop_length,
+                        )
+
+                if looping:
                     # Looping
                     if duration <= runtime:
                         active_cue.loop_counter += 1
                         active_cue.cue_start_time = now
                         active_cue.media_fadeIn = 0
-                        active_cue.video_data.seek_start()
+                        if self.owns_media(active_cue):
+                            active_cue.video_data.wrap_loop()
+                            active_cue.alpha_video_data.wrap_loop()
                 else:  # Not looping
                     if duration > 0.0:
                         fade_start_time = duration - active_cue.media_fadeOut
@@ -772,6 +1050,14 @@ class CueEngine:
                 "video_state": active_cue.video_data.status.name,
                 "uniforms": active_cue.shader_parameters
             }
+            if isinstance(active_cue.cue, VideoCue) and not self.owns_media(active_cue):
+                # A joined cue plays its owner's stream; the counts are reported there only.
+                cue_status["shared_with"] = self.media_owner(active_cue.share_group).cue.qid
+            elif isinstance(active_cue.cue, VideoCue):
+                stats = active_cue.frame_stats()
+                cue_status["dropped_frames"] = stats["dropped"]
+                cue_status["late_frames"] = stats["late"]
+                cue_status["repeated_frames"] = stats["repeated"]
             cue_status["uniforms"]["alpha"] = active_cue.alpha
 
             status["Active Cues"].append(cue_status)
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from fractions import Fraction
+import mmap
+import os
+from pathlib import Path
+import re
+import time
+from types import SimpleNamespace
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+import pygame
+
+from pyp_image import map_pyp_image, read_exr_rgba
+
+SEQUENCE_FPS = float(os.environ.get("PYPLAY_SEQUENCE_FPS", "25"))
+SEQUENCE_WORKERS = max(1, int(os.environ.get("PYPLAY_SEQUENCE_WORKERS", "4")))
+# Frames read ahead of the one the decode worker is waiting on.
+SEQUENCE_PREFETCH = max(1, int(os.environ.get("PYPLAY_SEQUENCE_PREFETCH", "8")))
+SEQUENCE_SUFFIXES = (".pyp", ".exr", ".png")
+
+# "shot.%04d.pyp" or "shot.####.pyp"
+_FRAME_PATTERN = re.compile(r"%0?\d*d|#+")
+_FRAME_NUMBER = re.compile(r"(\d+)(\.[^./\\]+)$")
+
+
+def _frame_pattern_match(name: str) -> Optional[re.Match]:
+    # The last %d/#### in the name is the frame number; earlier ones are part of the name.
+    matches = list(_FRAME_PATTERN.finditer(name))
+    return matches[-1] if matches else None
+
+
+def is_image_sequence(path: str) -> bool:
+    # Only a folder or a pattern of frame files that actually exist; any other path, even one
+    # with a '#' or '%d' in its name (eg: "Act #2 intro.mp4"), is ordinary media.
+    if os.path.isdir(path):
+        return bool(find_sequence_frames(path))
+    if Path(path).suffix.lower() not in SEQUENCE_SUFFIXES or os.path.isfile(path):
+        return False
+    return _frame_pattern_match(os.path.basename(path)) is not None and bool(find_sequence_frames(path))
+
+
+def find_sequence_frames(path: str) -> list[str]:
+    """
+    Frame files of a sequence, in frame-number order. path is either a folder of numbered
+    frames (the most common extension wins) or a filename pattern with %04d or ####.
+    """
+    if os.path.isdir(path):
+        folder = Path(path)
+        numbered = [
+            (int(match.group(1)), entry)
+            for entry in folder.iterdir()
+            if entry.suffix.lower() in SEQUENCE_SUFFIXES
+            and (match := _FRAME_NUMBER.search(entry.name)) is not None
+        ]
+        suffixes = [entry.suffix.lower() for _, entry in numbered]
+        if not suffixes:
+            return []
+        suffix = max(SEQUENCE_SUFFIXES, key=suffixes.count)
+        return [str(entry) for _, entry in sorted(numbered) if entry.suffix.lower() == suffix]
+
+    folder = Path(path).parent
+    name = Path(path).name
+    match = _frame_pattern_match(name)
+    if match is None or not folder.is_dir():
+        return []
+    matcher = re.compile(
+        re.escape(name[: match.start()]) + r"(\d+)" + re.escape(name[match.end() :]) + "$"
+    )
+    numbered = [
+        (int(found.group(1)), entry)
+        for entry in folder.iterdir()
+        if (found := matcher.match(entry.name)) is not None
+    ]
+    return [str(entry) for _, entry in sorted(numbered)]
+
+
+def prefault_pixels(pixels: np.ndarray) -> np.ndarray:
+    # Touch one byte per page so the disk read happens on the loading thread rather than
+    # as page faults inside the render thread's texture upload.
+    if isinstance(pixels, np.memmap) and pixels.flags.c_contiguous:
+        np.asarray(pixels).reshape(-1).view(np.uint8)[:: mmap.PAGESIZE].max(initial=0)
+    return pixels
+
+
+def read_sequence_frame(path: str, min_size: tuple[int, int] | None = None) -> np.ndarray:
+    # Same pixel layout as the matching still loader in video_handler.
+    suffix = Path(path).suffix.lower()
+    if suffix == ".pyp":
+        return prefault_pixels(map_pyp_image(path, min_size).pixels)
+    if suffix == ".exr":
+        return read_exr_rgba(path).pixels
+    surface = pygame.image.load(path)
+    width, height = surface.get_size()
+    raw = pygame.image.tobytes(surface, "RGBA", False)
+    return np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4)
+
+
+class SequenceFrame:
+    # The parts of av.VideoFrame the decode worker and presentation clock use.
+    __slots__ = ("pts", "time_base", "pixels")
+
+    def __init__(self, pts: int, time_base: Fraction, pixels: np.ndarray):
+        self.pts = pts
+        self.time_base = time_base
+        self.pixels = pixels
+
+    @property
+    def time(self) -> float:
+        return float(self.pts * self.time_base)
+
+
+class SequenceStream:
+    def __init__(self, frame_count: int, fps: float):
+        rate = Fraction(fps).limit_denominator(1001)
+        self.time_base = 1 / rate
+        self.average_rate = rate
+        self.guessed_rate = rate
+        self.duration = frame_count
+        self.start_time = 0
+        self.frames = frame_count
+
+
+class ImageSequence:
+    """
+    Plays a list of frame files through the same seek()/decode()/close() calls VideoData
+    makes on a PyAV container. Frames are read by a thread pool SEQUENCE_PREFETCH ahead of
+    the decode worker; when reads fall behind the presentation clock, frames that are
+    already too late are skipped and counted as dropped instead of being shown late.
+    """
+
+    def __init__(
+        self,
+        paths: list[str],
+        reader: Callable[[str], np.ndarray],
+        fps: float = SEQUENCE_FPS,
+        clock: Optional[Callable[[], Optional[float]]] = None,
+    ):
+        self.paths = paths
+        self.reader = reader
+        self.clock = clock
+        self.stream = SequenceStream(len(paths), fps)
+        self.streams = SimpleNamespace(video=[self.stream])
+        self.dropped_frames = 0
+        self._next_index = 0
+        self._pending: deque[tuple[int, Future]] = deque()
+        self._executor = ThreadPoolExecutor(
+            max_workers=min(SEQUENCE_WORKERS, SEQUENCE_PREFETCH), thread_name_prefix="sequence-read"
+        )
+        self._dropped_since_report = 0
+        self._last_report = 0.0
+
+    @property
+    def name(self) -> str:
+        return Path(self.paths[0]).name if self.paths else ""
+
+    def index_at(self, seconds: float) -> int:
+        index = int(Fraction(seconds).limit_denominator(1_000_000) / self.stream.time_base)
+        return min(max(0, index), max(0, len(self.paths) - 1))
+
+    def seek(self, offset: int, stream=None, any_frame: bool = False, backward: bool = True):
+        self._next_index = min(max(0, int(offset)), len(self.paths))
+
+    def decode(self, *args, **kwargs) -> Iterator[SequenceFrame]:
+        # Every generator follows the shared cursor, so a seek redirects the current one too.
+        while self._next_index < len(self.paths):
+            index = self._next_index
+            self._fill(index)
+            _, future = self._pending[0]
+
+            late_index = self._late_index(index)
+            if late_index > index and not future.done():
+                self._report_dropped(late_index - index)
+                self._next_index = late_index
+                continue
+
+            self._pending.popleft()
+            self._next_index = index + 1
+            try:
+                pixels = future.result()
+            except Exception as e:
+                print(f"[Sequence] Error reading {self.paths[index]}: {e} – skipping frame")
+                continue
+            yield SequenceFrame(index, self.stream.time_base, pixels)
+
+    def close(self):
+        for _, future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._executor.shutdown(wait=False)
+        if self._dropped_since_report:
+            self._report_dropped(0, force=True)
+
+    def _fill(self, index: int):
+        while self._pending and self._pending[0][0] != index:
+            _, future = self._pending.popleft()
+            future.cancel()
+        if self._pending and self._pending[-1][0] - index >= SEQUENCE_PREFETCH:
+            return
+        next_index = self._pending[-1][0] + 1 if self._pending else index
+        while next_index < min(len(self.paths), index + SEQUENCE_PREFETCH):
+            future = self._executor.submit(self.reader, self.paths[next_index])
+            self._pending.append((next_index, future))
+            next_index += 1
+
+    def _late_index(self, index: int) -> int:
+        # The first frame not yet past its display time, if frame `index` already is.
+        media_time = self.clock() if self.clock is not None else None
+        if media_time is None:
+            return index
+        due_index = self.index_at(media_time)
+        return due_index if due_index > index else index
+
+    def _report_dropped(self, count: int, force: bool = False):
+        self.dropped_frames += count
+        self._dropped_since_report += count
+        now = time.perf_counter()
+        if force or now - self._last_report >= 1.0:
+            print(
+                f"[Sequence] dropped={self._dropped_since_report} total_dropped={self.dropped_frames} "
+                f"(frame reads can't keep up with {float(self.stream.average_rate):.3g} fps) "
+                f"sequence={self.name}"
+            )
+            self._dropped_since_report = 0
+            self._last_report = now
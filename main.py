@@ -55,6 +55,52 @@ Profile environment variables:
   PYPLAY_PROFILE_CUES    Include slowest per-cue timings. Default: 0.
   PYPLAY_PROFILE_GPU     Insert glFinish around measured stages. Default: 0.
   PYPLAY_NDI_DEBUG       Print NDI capture/send debug logs. Default: 0.
+
+Playback environment variables:
+  PYPLAY_DECODE_QUEUE    Decoded frames buffered ahead per video. Default: 4.
+  PYPLAY_LOADER_WORKERS  Concurrent media loads. One worker is kept free of background
+                         index builds when there are two or more. Default: 2.
+  PYPLAY_PRELOAD_COUNT   Upcoming VideoCues kept loaded on standby. Default: 2.
+  PYPLAY_PRELOAD_BUDGET_MB
+                         Memory budget for standby media. Default: 512.
+  PYPLAY_STILL_CACHE_MB  Host memory for decoded stills shared between cues. Default: 1024.
+  PYPLAY_STILL_CACHE_VRAM_MB
+                         GPU memory for cached still textures. Default: 1024.
+  PYPLAY_DISK_CACHE_DIR  Where decoded PNG/JPEG/EXR stills are kept as .pyp for fast reloads,
+                         along with video keyframe indexes and content bounds.
+                         Default: ~/.cache/pyplay/stills.
+  PYPLAY_DISK_CACHE_MB   Disk space for decoded stills, 0 to disable. Default: 4096.
+  PYPLAY_DISK_INDEX_ENTRIES
+                         Videos whose keyframe index and content bounds are kept on disk;
+                         the least recently used are forgotten first. Default: 500.
+  PYPLAY_VIDEO_BOUNDS_SAMPLES
+                         Frames sampled per video to find its content bounds for scissoring,
+                         0 to disable. Default: 8.
+  PYPLAY_SHARE_JOIN_MS   Cues fired within this long of an identical cue (same media, start
+                         time and loop) share its decoder and textures. Default: 100.
+  PYPLAY_DECODE_DOWNSCALE
+                         1 to scale video frames down to the scene size on the decode worker
+                         before upload. Cues can override it with "decodeScale". Default: 0.
+  PYPLAY_DECODE_THREADS  Codec threads shared by all videos decoding at once. Default: CPU count.
+  PYPLAY_DECODE_THREADS_PER_STREAM
+                         Most codec threads one video may use. Default: half of
+                         PYPLAY_DECODE_THREADS.
+  PYPLAY_CATCHUP         How a video that falls behind catches up: off, nonref (skip decoding
+                         non-reference frames) or gop (also jump to a later keyframe). Default: gop.
+  PYPLAY_CATCHUP_GOP_MS  How far behind a video must be before jumping to a later keyframe.
+                         Default: 500.
+  PYPLAY_SEQUENCE_FPS    Frame rate of image-sequence cues (folders or shot.%04d.pyp). Default: 25.
+  PYPLAY_SEQUENCE_WORKERS
+                         Threads reading image-sequence frames. Default: 4.
+  PYPLAY_SEQUENCE_PREFETCH
+                         Image-sequence frames read ahead of playback. Default: 8.
+  PYPLAY_TEXTURE_POOL_MB Released textures kept for reuse by later cues. Default: 256.
+  PYPLAY_PBO_COUNT       Pixel buffers per video for streamed uploads, 0 to disable. Default: 2.
+  PYPLAY_UPLOAD_BUDGET_MS
+                         Per-frame time spent uploading large stills. Default: 4.
+  PYPLAY_BANDED_UPLOAD_MB
+                         Stills above this size upload in bands over several frames. Default: 16.
+  PYPLAY_PYP_THREADS     Threads decoding compressed .pyp bands. Default: CPU count.
 """
 
 args = sys.argv[1:]
@@ -409,7 +455,7 @@ def main():
     if renderer is None:
         print("[Startup] Unable to initialize any renderer mode. Exiting cleanly.")
         return 1
-    video_handler = VideoHandler()
+    video_handler = VideoHandler(target_size=renderer.scene_size)
     ndi_output = NDIOutput(
         NDIConfig(
             enabled=ndi_enabled,
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+import queue
+import threading
+import time
+from typing import Any, Optional
+
+import numpy as np
+
+from pyp_image import write_pyp_image
+
+STILL_CACHE_MB = max(0.0, float(os.environ.get("PYPLAY_STILL_CACHE_MB", "1024")))
+STILL_CACHE_VRAM_MB = max(0.0, float(os.environ.get("PYPLAY_STILL_CACHE_VRAM_MB", "1024")))
+DISK_CACHE_DIR = os.environ.get(
+    "PYPLAY_DISK_CACHE_DIR", str(Path.home() / ".cache" / "pyplay" / "stills")
+)
+DISK_CACHE_MB = max(0.0, float(os.environ.get("PYPLAY_DISK_CACHE_MB", "4096")))
+
+
+class CachedStill:
+    def __init__(
+        self,
+        key: tuple,
+        kind: str,
+        width: int,
+        height: int,
+        pixels: np.ndarray,
+        content_bounds_uv: tuple[float, float, float, float],
+        flags: dict[str, Any],
+    ):
+        self.key = key
+        self.kind = kind
+        self.width = width
+        self.height = height
+        self.pixels = pixels
+        self.content_bounds_uv = content_bounds_uv
+        self.flags = flags
+        # Shared by every VideoData showing this still, including the "filter" state entry.
+        self.textures: dict = {}
+        self.texture_bytes = 0
+        # True while one cue is still filling textures in bands; others wait for it.
+        self.uploading = False
+        self.refs = 0
+        self.last_used = time.monotonic()
+
+    @property
+    def pixel_bytes(self) -> int:
+        return int(self.pixels.nbytes) if self.pixels is not None else 0
+
+
+class StillCache:
+    """
+    Reference-counted still images keyed by (resolved path, mtime, size). Decoded pixels and
+    GL textures are shared between cues; unreferenced entries are evicted least recently used
+    first when host RAM or VRAM use goes over budget.
+    """
+
+    def __init__(self, ram_budget_mb: float = STILL_CACHE_MB, vram_budget_mb: float = STILL_CACHE_VRAM_MB):
+        self.ram_budget_bytes = int(ram_budget_mb * 1024 * 1024)
+        self.vram_budget_bytes = int(vram_budget_mb * 1024 * 1024)
+        self.entries: dict[tuple, CachedStill] = {}
+        self.hits = 0
+        self.misses = 0
+        self._released_textures: list[dict] = []
+        self._lock = threading.Lock()
+
+    def acquire(self, key: tuple | None) -> Optional[CachedStill]:
+        if key is None:
+            return None
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry.refs += 1
+            entry.last_used = time.monotonic()
+            return entry
+
+    def insert(self, entry: CachedStill) -> CachedStill:
+        with self._lock:
+            # Another loader may have finished the same still first; share theirs.
+            existing = self.entries.get(entry.key)
+            if existing is not None:
+                existing.refs += 1
+                existing.last_used = time.monotonic()
+                return existing
+            entry.refs = 1
+            self.entries[entry.key] = entry
+            self._evict_locked()
+            return entry
+
+    def release(self, entry: CachedStill):
+        with self._lock:
+            entry.refs = max(0, entry.refs - 1)
+            entry.last_used = time.monotonic()
+            self._evict_locked()
+
+    def set_textures(self, entry: CachedStill, textures: dict, texture_bytes: int):
+        with self._lock:
+            entry.textures = textures
+            entry.texture_bytes = texture_bytes
+            entry.uploading = False
+            self._evict_locked()
+
+    def begin_upload(self, entry: CachedStill, textures: dict, texture_bytes: int):
+        # Publish textures that are still being filled, so a second cue on the same still
+        # waits for them instead of uploading its own copy.
+        with self._lock:
+            entry.textures = textures
+            entry.texture_bytes = texture_bytes
+            entry.uploading = True
+
+    def abandon_upload(self, entry: CachedStill):
+        # The uploading cue was released before the last band; free the partial textures.
+        with self._lock:
+            if entry.uploading:
+                self._drop_textures_locked(entry)
+                entry.uploading = False
+
+    def take_released_textures(self) -> list[dict]:
+        # GL objects can only be freed on the render thread, so evictions queue them here.
+        with self._lock:
+            released = self._released_textures
+            self._released_textures = []
+            return released
+
+    def ram_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.pixel_bytes for entry in self.entries.values())
+
+    def vram_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.texture_bytes for entry in self.entries.values())
+
+    def _drop_textures_locked(self, entry: CachedStill):
+        if entry.textures:
+            self._released_textures.append(entry.textures)
+        entry.textures = {}
+        entry.texture_bytes = 0
+
+    def _evict_locked(self):
+        idle = sorted(
+            (entry for entry in self.entries.values() if entry.refs == 0),
+            key=lambda entry: entry.last_used,
+        )
+
+        ram_used = sum(entry.pixel_bytes for entry in self.entries.values())
+        vram_used = sum(entry.texture_bytes for entry in self.entries.values())
+        for entry in idle:
+            if ram_used <= self.ram_budget_bytes:
+                break
+            ram_used -= entry.pixel_bytes
+            vram_used -= entry.texture_bytes
+            self._drop_textures_locked(entry)
+            del self.entries[entry.key]
+
+        for entry in idle:
+            if vram_used <= self.vram_budget_bytes:
+                break
+            if entry.key not in self.entries or not entry.textures:
+                continue
+            vram_used -= entry.texture_bytes
+            self._drop_textures_locked(entry)
+
+
+class DiskStillCache:
+    """
+    Decoded PNG/JPEG/EXR stills saved as .pyp files, so later loads (including after a
+    restart) can memory-map them instead of decoding again. Files are named after the
+    source's resolved path, mtime and size, so an edited source never matches a stale
+    entry. Writes happen on a background thread; least recently used files are deleted
+    once the directory goes over budget.
+    """
+
+    def __init__(self, directory: str = DISK_CACHE_DIR, budget_mb: float = DISK_CACHE_MB):
+        self.directory = Path(directory)
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._pending: set[Path] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.budget_bytes > 0
+
+    def cache_path(self, key: tuple) -> Path:
+        # key is media_file_key(): (resolved path, mtime_ns, size)
+        path, mtime_ns, size = key[:3]
+        name = hashlib.sha1(str(path).encode("utf-8")).hexdigest()
+        return self.directory / f"{name}-{mtime_ns}-{size}.pyp"
+
+    def lookup(self, key: tuple | None) -> Optional[Path]:
+        if key is None or not self.enabled:
+            return None
+        path = self.cache_path(key)
+        try:
+            # Mark it recently used for eviction.
+            os.utime(path)
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def store(
+        self,
+        key: tuple | None,
+        pixels: np.ndarray,
+        content_bounds_uv: tuple[float, float, float, float],
+        pixel_type: str,
+    ):
+        if key is None or not self.enabled:
+            return
+        path = self.cache_path(key)
+        with self._lock:
+            if path in self._pending:
+                return
+            self._pending.add(path)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._writer, name="disk-still-cache", daemon=True)
+                self._thread.start()
+        self._queue.put((path, pixels, content_bounds_uv, pixel_type))
+
+    def _writer(self):
+        while True:
+            path, pixels, content_bounds_uv, pixel_type = self._queue.get()
+            write_start = time.perf_counter()
+            try:
+                self._write(path, pixels, content_bounds_uv, pixel_type)
+                print(
+                    f"[DiskCache] wrote {path.name} "
+                    f"write_ms={(time.perf_counter() - write_start) * 1000.0:.2f}"
+                )
+                self._evict(keep=path)
+            except Exception as e:
+                print(f"[DiskCache] Error writing {path}: {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(path)
+
+    def _write(
+        self,
+        path: Path,
+        pixels: np.ndarray,
+        content_bounds_uv: tuple[float, float, float, float],
+        pixel_type: str,
+    ):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Older versions of the same source can never match again.
+        prefix = path.name.split("-", 1)[0] + "-"
+        for stale in self.directory.glob(prefix + "*.pyp"):
+            try:
+                stale.unlink()
+            except OSError:
+                pass
+
+        partial = path.with_name(path.name + ".partial")
+        write_pyp_image(partial, pixels, content_bounds_uv=content_bounds_uv, pixel_type=pixel_type)
+        os.replace(partial, path)
+
+    def _evict(self, keep: Path):
+        files = []
+        for path in self.directory.glob("*.pyp"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        used = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if used <= self.budget_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                # Still mapped by a cue on platforms that lock mapped files.
+                continue
+            used -= size
+
+
+still_cache = StillCache()
+disk_still_cache = DiskStillCache()
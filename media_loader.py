@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from enum import IntEnum
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from video_handler import VideoData
+
+LOADER_WORKERS = max(1, int(os.environ.get("PYPLAY_LOADER_WORKERS", "2")))
+
+
+class LoadPriority(IntEnum):
+    SHOW = 0  # A cue has been fired and is waiting on this media
+    PRELOAD = 10  # Standby media for cues that haven't been fired yet
+    BACKGROUND = 20  # Indexing and probing media that has already loaded
+
+
+class LoadJob:
+    def __init__(
+        self,
+        path: str,
+        video_data: Optional["VideoData"],
+        priority: LoadPriority,
+        task: Optional[Callable[[], object]] = None,
+    ):
+        self.path = path
+        self.video_data = video_data
+        self.priority = priority
+        # Runs instead of the pool's loader (see MediaLoaderPool.submit_task).
+        self.task = task
+        self.queued_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.cancelled = False
+        self.done = threading.Event()
+        self._loader_returned = False
+        self._lock = threading.Lock()
+
+    def cancel(self) -> bool:
+        """
+        Cancels the job. Returns True if the loader is still running it, in which case the
+        worker releases the VideoData once the loader returns.
+        """
+        with self._lock:
+            self.cancelled = True
+            return self.started_at is not None and not self._loader_returned
+
+    @property
+    def queue_ms(self) -> float:
+        end = self.started_at if self.started_at is not None else time.perf_counter()
+        return (end - self.queued_at) * 1000.0
+
+    @property
+    def load_ms(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return (end - self.started_at) * 1000.0
+
+
+class MediaLoaderPool:
+    """
+    A fixed set of loader threads pulling media loads from a priority queue, so a burst of
+    cues can't start more concurrent decodes than there are workers. Background tasks never
+    take the last free worker, so a fired cue's load doesn't wait behind a long index build.
+    With a single worker there is no spare, so background tasks only run when nothing else
+    is queued, and a load submitted while one is running waits for it to finish.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str, "VideoData"], "VideoData"],
+        workers: int = LOADER_WORKERS,
+    ):
+        self.loader = loader
+        self.workers = max(1, workers)
+        self.background_workers = self.workers - 1
+        self._background_running = 0
+        self._heap: list[tuple[int, int, LoadJob]] = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"media-loader-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(
+        self,
+        path: str,
+        video_data: "VideoData",
+        priority: LoadPriority = LoadPriority.SHOW,
+    ) -> LoadJob:
+        job = LoadJob(path, video_data, priority)
+        with self._cond:
+            heapq.heappush(self._heap, (int(priority), next(self._sequence), job))
+            self._cond.notify()
+        return job
+
+    def submit_task(
+        self,
+        name: str,
+        task: Callable[[], object],
+        priority: LoadPriority = LoadPriority.BACKGROUND,
+    ) -> LoadJob:
+        job = LoadJob(name, None, priority, task)
+        with self._cond:
+            heapq.heappush(self._heap, (int(priority), next(self._sequence), job))
+            self._cond.notify()
+        return job
+
+    def promote(self, job: LoadJob, priority: LoadPriority = LoadPriority.SHOW):
+        # Re-queue at the higher priority; the stale heap entry is skipped when popped.
+        with self._cond:
+            if job.started_at is not None or job.cancelled or priority >= job.priority:
+                return
+            job.priority = priority
+            heapq.heappush(self._heap, (int(priority), next(self._sequence), job))
+            self._cond.notify()
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return sum(
+                1
+                for priority, _, job in self._heap
+                if priority == job.priority and job.started_at is None and not job.cancelled
+            )
+
+    def _next_job(self) -> LoadJob:
+        with self._cond:
+            while True:
+                while not self._heap:
+                    self._cond.wait()
+                priority, _, job = self._heap[0]
+                if (
+                    priority >= LoadPriority.BACKGROUND
+                    and self._background_running >= max(1, self.background_workers)
+                ):
+                    # Everything queued is background work; wait for a background slot. With
+                    # no spare worker the one worker takes it, as nothing else is waiting.
+                    self._cond.wait()
+                    continue
+                heapq.heappop(self._heap)
+                if priority != job.priority or job.started_at is not None:
+                    continue
+                with job._lock:
+                    if job.cancelled:
+                        job.done.set()
+                        continue
+                    job.started_at = time.perf_counter()
+                if priority >= LoadPriority.BACKGROUND:
+                    self._background_running += 1
+                return job
+
+    def _worker(self):
+        while True:
+            job = self._next_job()
+            try:
+                if job.task is not None:
+                    job.task()
+                else:
+                    self.loader(job.path, job.video_data)
+            except Exception as e:
+                print(f"[LoaderPool] Error loading {job.path}: {e}")
+            job.finished_at = time.perf_counter()
+            with job._lock:
+                job._loader_returned = True
+                cancelled = job.cancelled
+            if job.priority >= LoadPriority.BACKGROUND:
+                with self._cond:
+                    self._background_running -= 1
+                    self._cond.notify()
+
+            if cancelled and job.video_data is not None:
+                # The cue was stopped while we were loading; don't leave a decoder running.
+                job.video_data.release()
+
+            print(
+                f"[LoaderPool] priority={job.priority.name} queue_ms={job.queue_ms:.2f} "
+                f"load_ms={job.load_ms:.2f} cancelled={int(job.cancelled)} path={job.path}"
+            )
+            job.done.set()
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+import lzma
+import os
 import struct
+import zlib
 from pathlib import Path
 
 import numpy as np
@@ -16,11 +21,49 @@ except ImportError:
 
 PYP_MAGIC = b"PYP1"
 PYP_DTYPE_FLOAT16 = 1
+PYP_DTYPE_RGBA8 = 2  # 8-bit unorm per channel
+PYP_DTYPE_SRGB8_A8 = 3  # 8-bit sRGB-encoded colour; the GPU linearises it when sampling
+PYP_DTYPE_RGB10_A2 = 4  # One uint32 per pixel: 10-bit unorm R, G, B and 2-bit alpha
+PYP_DTYPE_R11G11B10F = 5  # One uint32 per pixel: unsigned 11/11/10-bit float R, G, B
+PYP_PIXEL_TYPES = {
+    "float16": PYP_DTYPE_FLOAT16,
+    "rgba8": PYP_DTYPE_RGBA8,
+    "srgb8_a8": PYP_DTYPE_SRGB8_A8,
+    "rgb10_a2": PYP_DTYPE_RGB10_A2,
+    "r11g11b10f": PYP_DTYPE_R11G11B10F,
+}
+# Unorm types hold sRGB-encoded colour: the player decodes rgba8/rgb10_a2 in the shader and
+# the GPU decodes srgb8_a8 when sampling, so linear sources are encoded before quantising.
+PYP_SRGB_TYPES = (PYP_DTYPE_RGBA8, PYP_DTYPE_SRGB8_A8, PYP_DTYPE_RGB10_A2)
+# Packed types always store this many channels, whatever the source had.
+PYP_PACKED_CHANNELS = {PYP_DTYPE_RGB10_A2: 4, PYP_DTYPE_R11G11B10F: 3}
 PYP_CHANNELS_RGB = 3
 PYP_CHANNELS_RGBA = 4
 PYP_HEADER_STRUCT = struct.Struct("<4sIIII4f")
 DEFAULT_BLACK_THRESHOLD = 1e-6
 
+# PYP3: the PYP1 header plus codec, band height and level count. A (width, height) entry per
+# level follows (level 0 is full size, each further level half the one before), then a table
+# of (file offset, stored size) for every row band of every level in order. Compressed bands
+# are byte-shuffled (every value's first byte, then every second byte, ...) and decode in
+# parallel; with PYP_CODEC_NONE bands are stored raw so a level can be memory-mapped.
+# PYP2 is the older single-level layout: the same header with a band count in place of the
+# level count and no level table. It is still read, but no longer written.
+PYP2_MAGIC = b"PYP2"
+PYP3_MAGIC = b"PYP3"
+PYP2_HEADER_STRUCT = struct.Struct("<4sIIII4fIII")
+PYP2_LEVEL_STRUCT = struct.Struct("<II")
+PYP2_BAND_STRUCT = struct.Struct("<QQ")
+PYP2_BAND_ROWS = 64
+PYP_CODEC_NONE = 0
+PYP_CODEC_ZLIB = 1
+PYP_CODEC_LZMA = 2
+PYP_CODECS = {"none": PYP_CODEC_NONE, "zlib": PYP_CODEC_ZLIB, "lzma": PYP_CODEC_LZMA}
+CONTENT_BOUNDS_BAND_BYTES = 4 * 1024 * 1024
+PYP_THREADS = max(1, int(os.environ.get("PYPLAY_PYP_THREADS", str(os.cpu_count() or 1))))
+
+_band_executor: ThreadPoolExecutor | None = None
+
 
 @dataclass(frozen=True)
 class PypImage:
@@ -28,6 +71,16 @@ class PypImage:
     height: int
     pixels: np.ndarray
     content_bounds_uv: tuple[float, float, float, float]
+    level: int = 0
+    data_type: int = PYP_DTYPE_FLOAT16
+
+
+def _band_content_extent(band: np.ndarray, threshold: float) -> tuple[np.ndarray, np.ndarray]:
+    # (rows, columns) of the band that have any channel above the threshold.
+    mask = np.abs(band[..., 0]) > threshold
+    for channel in range(1, band.shape[2]):
+        mask |= np.abs(band[..., channel]) > threshold
+    return mask.any(axis=1), mask.any(axis=0)
 
 
 def find_content_bounds_uv(
@@ -37,22 +90,26 @@ def find_content_bounds_uv(
     if width <= 0 or height <= 0:
         return (0.0, 0.0, 1.0, 1.0)
 
-    if image.ndim < 3:
-        mask = np.abs(image) > threshold
+    # RGB plus alpha; works through the image a band of rows at a time so the masks stay
+    # small, and spreads the bands over PYP_THREADS (numpy releases the GIL for these).
+    pixels = image[..., None] if image.ndim < 3 else image[..., : min(4, image.shape[2])]
+    row_bytes = max(1, width * pixels.shape[2] * pixels.itemsize)
+    band_rows = max(1, CONTENT_BOUNDS_BAND_BYTES // row_bytes)
+    bands = [pixels[row : row + band_rows] for row in range(0, height, band_rows)]
+    if len(bands) > 1 and PYP_THREADS > 1:
+        extents = list(_executor().map(lambda band: _band_content_extent(band, threshold), bands))
     else:
-        rgb_mask = np.any(np.abs(image[..., : min(3, image.shape[2])]) > threshold, axis=-1)
-        if image.shape[2] >= 4:
-            alpha_mask = np.abs(image[..., 3]) > threshold
-            mask = rgb_mask | alpha_mask
-        else:
-            mask = rgb_mask
+        extents = [_band_content_extent(band, threshold) for band in bands]
 
-    non_zero = np.argwhere(mask)
-    if non_zero.size == 0:
+    rows = np.concatenate([band_rows_any for band_rows_any, _ in extents])
+    columns = np.logical_or.reduce([band_columns_any for _, band_columns_any in extents])
+    if not rows.any():
         return (0.0, 0.0, 1.0, 1.0)
 
-    min_y, min_x = non_zero.min(axis=0)
-    max_y, max_x = non_zero.max(axis=0)
+    row_indices = np.flatnonzero(rows)
+    column_indices = np.flatnonzero(columns)
+    min_y, max_y = row_indices[0], row_indices[-1]
+    min_x, max_x = column_indices[0], column_indices[-1]
 
     return (
         float(min_x) / float(width),
@@ -77,21 +134,16 @@ def read_exr_rgba(path: str | Path) -> PypImage:
     pixel_type = Imath.PixelType(Imath.PixelType.FLOAT)
     channel_names = header["channels"].keys()
 
-    def read_channel(name: str, fallback: float = 0.0) -> np.ndarray:
+    # Fill one channel at a time so only a single channel's raw bytes exist alongside the
+    # final image (stacking all four would hold the image twice).
+    rgba = np.empty((height, width, 4), dtype=np.float32)
+    for index, (name, fallback) in enumerate((("R", 0.0), ("G", 0.0), ("B", 0.0), ("A", 1.0))):
         if name in channel_names:
             raw = exr.channel(name, pixel_type)
-            return np.frombuffer(raw, dtype=np.float32).reshape(height, width)
-        return np.full((height, width), fallback, dtype=np.float32)
-
-    rgba = np.stack(
-        [
-            read_channel("R"),
-            read_channel("G"),
-            read_channel("B"),
-            read_channel("A", 1.0),
-        ],
-        axis=-1,
-    ).astype(np.float32, copy=False)
+            rgba[..., index] = np.frombuffer(raw, dtype=np.float32).reshape(height, width)
+            del raw
+        else:
+            rgba[..., index] = fallback
 
     return PypImage(
         width=width,
@@ -101,58 +153,448 @@ def read_exr_rgba(path: str | Path) -> PypImage:
     )
 
 
+def pyp_storage(data_type: int, width: int, height: int, channels: int):
+    # (numpy dtype, array shape) of a stored image; packed types are one uint32 per pixel.
+    if data_type in PYP_PACKED_CHANNELS:
+        return np.dtype("<u4"), (height, width)
+    if data_type == PYP_DTYPE_FLOAT16:
+        return np.dtype("<f2"), (height, width, channels)
+    return np.dtype(np.uint8), (height, width, channels)
+
+
+def linear_to_srgb(values: np.ndarray) -> np.ndarray:
+    values = np.clip(values, 0.0, 1.0)
+    return np.where(values <= 0.0031308, values * 12.92, 1.055 * np.power(values, 1.0 / 2.4) - 0.055)
+
+
+def srgb_to_linear(values: np.ndarray) -> np.ndarray:
+    return np.where(values <= 0.04045, values / 12.92, np.power((values + 0.055) / 1.055, 2.4))
+
+
+def encode_pyp_pixels(pixels: np.ndarray, data_type: int, linear: bool = False) -> np.ndarray:
+    # Takes float pixels, or uint8 unorm pixels (eg: decoded PNG/JPEG); 8-bit types store
+    # uint8 input as-is rather than going through a float copy. linear marks linear-light
+    # float pixels (eg: EXR), which PYP_SRGB_TYPES store sRGB-encoded.
+    if pixels.dtype == np.uint8:
+        if data_type in (PYP_DTYPE_RGBA8, PYP_DTYPE_SRGB8_A8):
+            return np.ascontiguousarray(pixels)
+        pixels = pixels.astype(np.float32) / 255.0
+    elif linear and data_type in PYP_SRGB_TYPES:
+        pixels = pixels.astype(np.float32)
+        pixels[..., :3] = linear_to_srgb(pixels[..., :3])
+    if data_type == PYP_DTYPE_FLOAT16:
+        return np.ascontiguousarray(pixels.astype(np.float16, copy=False))
+    if data_type in (PYP_DTYPE_RGBA8, PYP_DTYPE_SRGB8_A8):
+        return np.ascontiguousarray(np.round(np.clip(pixels, 0.0, 1.0) * 255.0).astype(np.uint8))
+    if data_type == PYP_DTYPE_RGB10_A2:
+        rgb = np.round(np.clip(pixels[..., :3], 0.0, 1.0) * 1023.0).astype(np.uint32)
+        if pixels.shape[2] >= 4:
+            alpha = np.round(np.clip(pixels[..., 3], 0.0, 1.0) * 3.0).astype(np.uint32)
+        else:
+            alpha = np.full(pixels.shape[:2], 3, dtype=np.uint32)
+        return rgb[..., 0] | (rgb[..., 1] << 10) | (rgb[..., 2] << 20) | (alpha << 30)
+    if data_type == PYP_DTYPE_R11G11B10F:
+        # 11/10-bit floats share float16's 5-bit exponent, so they're float16 with the sign
+        # and low mantissa bits dropped.
+        rgb = np.clip(np.nan_to_num(pixels[..., :3], nan=0.0), 0.0, 65000.0)
+        half = rgb.astype(np.float16).view(np.uint16).astype(np.uint32)
+        red = (half[..., 0] >> 4) & 0x7FF
+        green = (half[..., 1] >> 4) & 0x7FF
+        blue = (half[..., 2] >> 5) & 0x3FF
+        return red | (green << 11) | (blue << 22)
+    raise ValueError(f"Unsupported PYP data type {data_type}")
+
+
+def decode_pyp_pixels(pixels: np.ndarray, data_type: int) -> np.ndarray:
+    # Back to linear-light float32 HxWxC, for tools that need plain pixels (eg: EXR export).
+    if data_type == PYP_DTYPE_FLOAT16:
+        return pixels.astype(np.float32)
+    if data_type in PYP_SRGB_TYPES:
+        if data_type == PYP_DTYPE_RGB10_A2:
+            packed = pixels.astype(np.uint32)
+            channels = [(packed >> shift) & 0x3FF for shift in (0, 10, 20)]
+            rgba = [channel.astype(np.float32) / 1023.0 for channel in channels]
+            rgba.append((packed >> 30).astype(np.float32) / 3.0)
+            result = np.stack(rgba, axis=-1)
+        else:
+            result = pixels.astype(np.float32) / 255.0
+        result[..., :3] = srgb_to_linear(result[..., :3])
+        return result
+    packed = pixels.astype(np.uint32)
+    if data_type == PYP_DTYPE_R11G11B10F:
+        halves = [((packed >> 0) & 0x7FF) << 4, ((packed >> 11) & 0x7FF) << 4, ((packed >> 22) & 0x3FF) << 5]
+        return np.stack(
+            [half.astype(np.uint16).view(np.float16).astype(np.float32) for half in halves], axis=-1
+        )
+    raise ValueError(f"Unsupported PYP data type {data_type}")
+
+
+def _executor() -> ThreadPoolExecutor:
+    # zlib and lzma release the GIL, so threads are enough to spread bands over cores.
+    global _band_executor
+    if _band_executor is None:
+        _band_executor = ThreadPoolExecutor(max_workers=PYP_THREADS, thread_name_prefix="pyp-band")
+    return _band_executor
+
+
+def _compress_band(band: np.ndarray, codec: int) -> bytes:
+    band = np.ascontiguousarray(band)
+    if codec == PYP_CODEC_NONE:
+        return band.tobytes()
+    shuffled = band.view(np.uint8).reshape(-1, band.dtype.itemsize).T.tobytes()
+    if codec == PYP_CODEC_LZMA:
+        return lzma.compress(shuffled, preset=6)
+    return zlib.compress(shuffled, 6)
+
+
+def _decompress_band(raw: memoryview, codec: int, out: np.ndarray, path: str | Path) -> None:
+    if codec == PYP_CODEC_NONE:
+        if len(raw) != out.nbytes:
+            raise ValueError(f"PYP band size mismatch in {path!s}")
+        out.view(np.uint8).reshape(-1)[:] = np.frombuffer(raw, dtype=np.uint8)
+        return
+    shuffled = lzma.decompress(raw) if codec == PYP_CODEC_LZMA else zlib.decompress(raw)
+    if len(shuffled) != out.nbytes:
+        raise ValueError(f"PYP band size mismatch in {path!s}")
+    itemsize = out.dtype.itemsize
+    out.view(np.uint8).reshape(-1, itemsize)[:] = (
+        np.frombuffer(shuffled, dtype=np.uint8).reshape(itemsize, -1).T
+    )
+
+
+def build_pyp_levels(pixels: np.ndarray, levels: int) -> list[np.ndarray]:
+    # 2x2 box filter per level; an odd last row or column is dropped.
+    result = [pixels]
+    while len(result) < levels:
+        height, width = result[-1].shape[:2]
+        if height < 2 or width < 2:
+            break
+        source = result[-1][: height // 2 * 2, : width // 2 * 2].astype(np.float32)
+        half = (source[0::2, 0::2] + source[1::2, 0::2] + source[0::2, 1::2] + source[1::2, 1::2]) * 0.25
+        result.append(np.ascontiguousarray(half.astype(pixels.dtype)))
+    return result
+
+
 def write_pyp_image(
     path: str | Path,
     pixels: np.ndarray,
     content_bounds_uv: tuple[float, float, float, float] | None = None,
     black_threshold: float = DEFAULT_BLACK_THRESHOLD,
+    compression: str | None = None,
+    band_rows: int = PYP2_BAND_ROWS,
+    levels: int = 1,
+    pixel_type: str = "float16",
+    linear: bool = False,
 ) -> None:
     if pixels.ndim != 3 or pixels.shape[2] not in (PYP_CHANNELS_RGB, PYP_CHANNELS_RGBA):
         raise ValueError("PYP images must be HxWx3 RGB or HxWx4 RGBA arrays.")
+    if compression is not None and compression not in PYP_CODECS:
+        raise ValueError(f"Unsupported PYP compression {compression!r}.")
+    if pixel_type not in PYP_PIXEL_TYPES:
+        raise ValueError(f"Unsupported PYP pixel type {pixel_type!r}.")
 
     height, width, channels = pixels.shape
+    data_type = PYP_PIXEL_TYPES[pixel_type]
+    channels = PYP_PACKED_CHANNELS.get(data_type, channels)
     bounds = content_bounds_uv or find_content_bounds_uv(pixels, threshold=black_threshold)
-    pixels16 = np.ascontiguousarray(pixels.astype(np.float16, copy=False))
+
+    if compression is None and levels > 1:
+        compression = "none"
+    if compression is not None:
+        source = pixels
+        if levels > 1 and pixels.dtype == np.uint8:
+            source = pixels.astype(np.float32) / 255.0
+        elif levels > 1:
+            source = pixels.astype(np.float32, copy=False)
+        _write_pyp2(
+            path,
+            [
+                encode_pyp_pixels(level, data_type, linear)
+                for level in build_pyp_levels(source, max(1, levels))
+            ],
+            bounds,
+            PYP_CODECS[compression],
+            max(1, band_rows),
+            data_type,
+            channels,
+        )
+        return
 
     header = PYP_HEADER_STRUCT.pack(
         PYP_MAGIC,
         width,
         height,
         channels,
-        PYP_DTYPE_FLOAT16,
+        data_type,
         *bounds,
     )
-    Path(path).write_bytes(header + pixels16.tobytes())
+    Path(path).write_bytes(header + encode_pyp_pixels(pixels, data_type, linear).tobytes())
 
 
-def read_pyp_image(path: str | Path) -> PypImage:
-    raw = Path(path).read_bytes()
-    if len(raw) < PYP_HEADER_STRUCT.size:
+def _write_pyp2(
+    path: str | Path,
+    levels: list[np.ndarray],
+    bounds: tuple[float, float, float, float],
+    codec: int,
+    band_rows: int,
+    data_type: int,
+    channels: int,
+) -> None:
+    height, width = levels[0].shape[:2]
+    bands = [
+        level[row : row + band_rows] for level in levels for row in range(0, level.shape[0], band_rows)
+    ]
+    stored = list(_executor().map(lambda band: _compress_band(band, codec), bands))
+
+    header = PYP2_HEADER_STRUCT.pack(
+        PYP3_MAGIC,
+        width,
+        height,
+        channels,
+        data_type,
+        *bounds,
+        codec,
+        band_rows,
+        len(levels),
+    )
+    level_table = b"".join(PYP2_LEVEL_STRUCT.pack(level.shape[1], level.shape[0]) for level in levels)
+    offset = len(header) + len(level_table) + PYP2_BAND_STRUCT.size * len(bands)
+    index = []
+    for data in stored:
+        index.append(PYP2_BAND_STRUCT.pack(offset, len(data)))
+        offset += len(data)
+    Path(path).write_bytes(header + level_table + b"".join(index) + b"".join(stored))
+
+
+def _check_pyp_format(path: str | Path, channels: int, data_type: int) -> None:
+    if channels not in (PYP_CHANNELS_RGB, PYP_CHANNELS_RGBA):
+        raise ValueError(f"Unsupported PYP channel count {channels} in {path!s}")
+    if data_type not in PYP_PIXEL_TYPES.values():
+        raise ValueError(f"Unsupported PYP data type {data_type} in {path!s}")
+    if PYP_PACKED_CHANNELS.get(data_type, channels) != channels:
+        raise ValueError(f"PYP data type {data_type} can't hold {channels} channels in {path!s}")
+
+
+def _read_pyp_header(path: str | Path, header: bytes, file_size: int):
+    if len(header) < PYP_HEADER_STRUCT.size:
         raise ValueError(f"PYP file is too small: {path}")
 
     magic, width, height, channels, data_type, *bounds = PYP_HEADER_STRUCT.unpack(
-        raw[: PYP_HEADER_STRUCT.size]
+        header[: PYP_HEADER_STRUCT.size]
     )
     if magic != PYP_MAGIC:
         raise ValueError(f"Unsupported PYP magic in {path!s}")
-    if channels not in (PYP_CHANNELS_RGB, PYP_CHANNELS_RGBA):
-        raise ValueError(f"Unsupported PYP channel count {channels} in {path!s}")
-    if data_type != PYP_DTYPE_FLOAT16:
-        raise ValueError(f"Unsupported PYP data type {data_type} in {path!s}")
+    _check_pyp_format(path, channels, data_type)
 
-    expected_bytes = width * height * channels * np.dtype(np.float16).itemsize
-    payload = raw[PYP_HEADER_STRUCT.size :]
-    if len(payload) != expected_bytes:
+    dtype, shape = pyp_storage(data_type, width, height, channels)
+    expected_bytes = int(np.prod(shape)) * dtype.itemsize
+    payload_bytes = file_size - PYP_HEADER_STRUCT.size
+    if payload_bytes != expected_bytes:
         raise ValueError(
-            f"PYP payload size mismatch in {path!s}: expected {expected_bytes}, got {len(payload)}"
+            f"PYP payload size mismatch in {path!s}: expected {expected_bytes}, got {payload_bytes}"
+        )
+    return width, height, channels, tuple(float(v) for v in bounds), data_type
+
+
+def _read_pyp2_layout(path: str | Path, handle, file_size: int):
+    header = handle.read(PYP2_HEADER_STRUCT.size)
+    if len(header) < PYP2_HEADER_STRUCT.size:
+        raise ValueError(f"PYP file is too small: {path}")
+    magic, width, height, channels, data_type, *rest = PYP2_HEADER_STRUCT.unpack(header)
+    bounds = tuple(float(v) for v in rest[:4])
+    codec, band_rows, count = rest[4:]
+    _check_pyp_format(path, channels, data_type)
+    if codec not in PYP_CODECS.values():
+        raise ValueError(f"Unsupported PYP codec {codec} in {path!s}")
+    if band_rows <= 0 or count <= 0:
+        raise ValueError(f"Invalid PYP band layout in {path!s}")
+
+    if magic == PYP2_MAGIC:
+        # Single level; the last header field is its band count.
+        levels = [(width, height)]
+        if count != (height + band_rows - 1) // band_rows:
+            raise ValueError(f"Invalid PYP band layout in {path!s}")
+    else:
+        level_table = handle.read(PYP2_LEVEL_STRUCT.size * count)
+        if len(level_table) != PYP2_LEVEL_STRUCT.size * count:
+            raise ValueError(f"PYP level table is truncated in {path!s}")
+        levels = list(PYP2_LEVEL_STRUCT.iter_unpack(level_table))
+        if levels[0] != (width, height):
+            raise ValueError(f"PYP level 0 does not match the image size in {path!s}")
+
+    band_counts = [(level_height + band_rows - 1) // band_rows for _, level_height in levels]
+    index = handle.read(PYP2_BAND_STRUCT.size * sum(band_counts))
+    if len(index) != PYP2_BAND_STRUCT.size * sum(band_counts):
+        raise ValueError(f"PYP band index is truncated in {path!s}")
+    data_start = handle.tell()
+    bands = list(PYP2_BAND_STRUCT.iter_unpack(index))
+    for band, (offset, size) in enumerate(bands):
+        if offset < data_start or offset + size > file_size:
+            raise ValueError(f"PYP band {band} lies outside the file in {path!s}")
+
+    level_bands = []
+    for count in band_counts:
+        level_bands.append(bands[:count])
+        bands = bands[count:]
+    return channels, data_type, bounds, codec, band_rows, levels, level_bands
+
+
+def pick_pyp_level(levels: list[tuple[int, int]], min_size: tuple[int, int] | None) -> int:
+    # Smallest level that still covers min_size in both directions.
+    chosen = 0
+    if min_size:
+        for index, (width, height) in enumerate(levels):
+            if width >= min_size[0] and height >= min_size[1]:
+                chosen = index
+    return chosen
+
+
+def _read_pyp2(path: str | Path, handle, min_size: tuple[int, int] | None) -> PypImage:
+    file_size = os.fstat(handle.fileno()).st_size
+    channels, data_type, bounds, codec, band_rows, levels, level_bands = _read_pyp2_layout(
+        path, handle, file_size
+    )
+    level = pick_pyp_level(levels, min_size)
+    width, height = levels[level]
+    bands = level_bands[level]
+
+    # Only the chosen level's bands are read, in a single pass.
+    start = min(offset for offset, _ in bands)
+    end = max(offset + size for offset, size in bands)
+    handle.seek(start)
+    payload = memoryview(handle.read(end - start))
+
+    dtype, shape = pyp_storage(data_type, width, height, channels)
+    pixels = np.empty(shape, dtype=dtype)
+    jobs = []
+    for band, (offset, size) in enumerate(bands):
+        row = band * band_rows
+        jobs.append(
+            _executor().submit(
+                _decompress_band,
+                payload[offset - start : offset - start + size],
+                codec,
+                pixels[row : row + band_rows],
+                path,
+            )
         )
+    for job in jobs:
+        job.result()
+
+    return PypImage(
+        width=width,
+        height=height,
+        pixels=pixels,
+        content_bounds_uv=bounds,
+        level=level,
+        data_type=data_type,
+    )
+
+
+def read_pyp_image(path: str | Path, min_size: tuple[int, int] | None = None) -> PypImage:
+    with open(path, "rb") as handle:
+        if handle.read(len(PYP2_MAGIC)) in (PYP2_MAGIC, PYP3_MAGIC):
+            handle.seek(0)
+            return _read_pyp2(path, handle, min_size)
+        handle.seek(0)
+        header = handle.read(PYP_HEADER_STRUCT.size)
+        file_size = os.fstat(handle.fileno()).st_size
+        width, height, channels, bounds, data_type = _read_pyp_header(path, header, file_size)
+        dtype, shape = pyp_storage(data_type, width, height, channels)
+        pixels = np.fromfile(handle, dtype=dtype, count=int(np.prod(shape)))
 
-    pixels = np.frombuffer(payload, dtype=np.float16).reshape(height, width, channels)
     return PypImage(
         width=width,
         height=height,
-        pixels=np.ascontiguousarray(pixels),
-        content_bounds_uv=tuple(float(v) for v in bounds),
+        pixels=pixels.reshape(shape),
+        content_bounds_uv=bounds,
+        data_type=data_type,
+    )
+
+
+def map_pyp_image(path: str | Path, min_size: tuple[int, int] | None = None) -> PypImage:
+    # Read-only view straight over the page cache; nothing is copied until the GL upload.
+    # Compressed banded files can't be mapped, so those are decoded instead.
+    with open(path, "rb") as handle:
+        header = handle.read(PYP_HEADER_STRUCT.size)
+        file_size = os.fstat(handle.fileno()).st_size
+        if header[: len(PYP2_MAGIC)] in (PYP2_MAGIC, PYP3_MAGIC):
+            handle.seek(0)
+            channels, data_type, bounds, codec, _, levels, level_bands = _read_pyp2_layout(
+                path, handle, file_size
+            )
+            if codec != PYP_CODEC_NONE:
+                handle.seek(0)
+                return _read_pyp2(path, handle, min_size)
+            level = pick_pyp_level(levels, min_size)
+            width, height = levels[level]
+            dtype, shape = pyp_storage(data_type, width, height, channels)
+            offset = level_bands[level][0][0]
+            if sum(size for _, size in level_bands[level]) != int(np.prod(shape)) * dtype.itemsize:
+                raise ValueError(f"PYP level {level} size mismatch in {path!s}")
+            pixels = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+            return PypImage(
+                width=width,
+                height=height,
+                pixels=pixels,
+                content_bounds_uv=bounds,
+                level=level,
+                data_type=data_type,
+            )
+
+    width, height, channels, bounds, data_type = _read_pyp_header(path, header, file_size)
+    dtype, shape = pyp_storage(data_type, width, height, channels)
+    pixels = np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        offset=PYP_HEADER_STRUCT.size,
+        shape=shape,
+    )
+    return PypImage(
+        width=width, height=height, pixels=pixels, content_bounds_uv=bounds, data_type=data_type
+    )
+
+
+def _level_count(value: str) -> int:
+    levels = int(value)
+    if levels < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return levels
+
+
+def _black_threshold(value: str) -> float:
+    threshold = float(value)
+    if threshold < 0.0:
+        raise argparse.ArgumentTypeError("must be non-negative")
+    return threshold
+
+
+def add_pyp_arguments(parser: argparse.ArgumentParser) -> None:
+    # The output options every .pyp converter script shares; they map onto write_pyp_image.
+    parser.add_argument(
+        "--compress",
+        choices=sorted(PYP_CODECS),
+        help="Write a banded PYP3 file with the given codec instead of PYP1 ('none' keeps it mappable).",
+    )
+    parser.add_argument(
+        "--levels",
+        type=_level_count,
+        default=1,
+        help="Store this many half-size levels (including full size) so players can load a smaller one.",
+    )
+    parser.add_argument(
+        "--pixel-type",
+        choices=list(PYP_PIXEL_TYPES),
+        default="float16",
+        help="Stored pixel type. rgba8/srgb8_a8/rgb10_a2 clamp to 0-1 and hold sRGB-encoded colour; "
+        "r11g11b10f drops alpha.",
+    )
+    parser.add_argument(
+        "--black-threshold",
+        type=_black_threshold,
+        default=DEFAULT_BLACK_THRESHOLD,
+        help="Threshold used when detecting non-black pixels for content bounds metadata.",
     )
 
 
@@ -46,6 +46,12 @@ class AlphaMode(StrEnum):
             return 3
 
 
+class AlphaPacking(StrEnum):
+    Separate = "Separate"  # Matte comes from alphaPath
+    SideBySide = "SideBySide"  # Colour on the left half of path's frames, matte on the right
+    Stacked = "Stacked"  # Colour on the top half of path's frames, matte on the bottom
+
+
 class LoopMode(StrEnum):
     OneShot = "OneShot"
     Looped = "Looped"
@@ -206,6 +212,7 @@ class VideoCue(Cue):
     dmxAddress: Optional[int] = None  # Start channel for RGB + optional layerAlpha on channel 4
     stompsOthers: bool = False
     alphaMode: Optional[AlphaMode] = AlphaMode.Opaque
+    alphaPacking: Optional[AlphaPacking] = AlphaPacking.Separate
     alphaSoftness: Optional[float] = 0.0
     startTime: Optional[timedelta] = None
     duration: Optional[timedelta] = None
@@ -222,6 +229,7 @@ class VideoCue(Cue):
     rotation: Optional[float] = 0.0
     offset: Optional[Point] = None
     shaderParameters: Optional[list[ShaderParam]] = None
+    decodeScale: Optional[bool] = None  # Decode at output size; None uses PYPLAY_DECODE_DOWNSCALE
 
 
 @dataclass
@@ -427,6 +435,7 @@ def parse_cue(data: Dict[str, Any]) -> CueUnion:
             alphaPath=data.get("alphaPath", ""),
             dmxAddress=parse_dmx_address(data.get("dmxAddress"), str(base["qid"])),
             alphaMode=parse_enum(AlphaMode, data.get("alphaMode")),
+            alphaPacking=parse_enum(AlphaPacking, data.get("alphaPacking", AlphaPacking.Separate)),
             alphaSoftness=data.get("alphaSoftness", 0.0),
             startTime=parse_timecode(data.get("startTime", "00:00:00.00")),
             duration=parse_timecode(data.get("duration", "00:00:00.00")),
@@ -447,6 +456,7 @@ def parse_cue(data: Dict[str, Any]) -> CueUnion:
                 parse_shader_param(x)
                 for x in data.get("shaderParameters", data.get("uniforms", []))
             ],
+            decodeScale=data.get("decodeScale"),
         )
     elif cue_type == CueType.VideoFramingCue:
         return VideoFraming(
@@ -33,9 +33,22 @@ from qplayer_config import (
     VideoFraming,
     FadeType,
     AlphaMode,
+    AlphaPacking,
     ShaderParams,
 )
-from video_handler import VideoStatus, VideoHandler, VideoData, VideoFrameFormat
+from image_sequence import SequenceFrame
+from media_cache import still_cache
+from pyp_image import PYP_DTYPE_R11G11B10F, PYP_DTYPE_RGB10_A2, PYP_DTYPE_RGBA8, PYP_DTYPE_SRGB8_A8
+from video_handler import (
+    VideoStatus,
+    VideoHandler,
+    VideoData,
+    VideoFrameFormat,
+    decode_thread_budget,
+    get_next_frame_pair,
+    negotiate_decode_format,
+    take_released_textures,
+)
 
 TEXTURE_UNIT_LOOKUP = [
     GL_TEXTURE0,
@@ -57,6 +70,263 @@ TEXTURE_UNIT_LOOKUP = [
 ]
 
 
+# GL formats for packed .pyp pixel types, as (RGB, RGBA) pairs of
+# (internal format, external format, data type).
+PYP_GL_FORMATS = {
+    PYP_DTYPE_RGBA8: (
+        (GL_RGB8, GL_RGB, GL_UNSIGNED_BYTE),
+        (GL_RGBA8, GL_RGBA, GL_UNSIGNED_BYTE),
+    ),
+    PYP_DTYPE_SRGB8_A8: (
+        (GL_SRGB8, GL_RGB, GL_UNSIGNED_BYTE),
+        (GL_SRGB8_ALPHA8, GL_RGBA, GL_UNSIGNED_BYTE),
+    ),
+    PYP_DTYPE_RGB10_A2: (
+        (GL_RGB10_A2, GL_RGBA, GL_UNSIGNED_INT_2_10_10_10_REV),
+        (GL_RGB10_A2, GL_RGBA, GL_UNSIGNED_INT_2_10_10_10_REV),
+    ),
+    PYP_DTYPE_R11G11B10F: (
+        (GL_R11F_G11F_B10F, GL_RGB, GL_UNSIGNED_INT_10F_11F_11F_REV),
+        (GL_R11F_G11F_B10F, GL_RGB, GL_UNSIGNED_INT_10F_11F_11F_REV),
+    ),
+}
+
+TEXTURE_BYTES_PER_PIXEL = {
+    int(GL_R8): 1,
+    int(GL_RG8): 2,
+    int(GL_RGB8): 4,  # Drivers pad RGB8 out to 32 bits
+    int(GL_RGBA8): 4,
+    int(GL_SRGB8): 4,
+    int(GL_SRGB8_ALPHA8): 4,
+    int(GL_RGB10_A2): 4,
+    int(GL_R11F_G11F_B10F): 4,
+    int(GL_RGB16F): 8,
+    int(GL_RGBA16F): 8,
+}
+
+
+class TexturePool:
+    """
+    Owns the GL textures used for cue media. Textures from completed cues are kept by
+    (width, height, internal format) and handed to the next cue that needs the same shape,
+    so starting a cue only uploads pixels instead of allocating.
+    """
+
+    def __init__(self, budget_mb: float | None = None):
+        if budget_mb is None:
+            budget_mb = float(os.environ.get("PYPLAY_TEXTURE_POOL_MB", "256"))
+        self.budget_bytes = int(max(0.0, budget_mb) * 1024 * 1024)
+        self.free: dict[tuple[int, int, int], list[int]] = {}
+        self.textures: dict[int, tuple[tuple[int, int, int], int]] = {}
+        self.live_bytes = 0
+        self.free_bytes = 0
+        self.allocated = 0
+        self.reused = 0
+
+    @staticmethod
+    def texture_bytes(width: int, height: int, internal_format) -> int:
+        return int(width * height * TEXTURE_BYTES_PER_PIXEL.get(int(internal_format), 4))
+
+    def acquire(
+        self,
+        width: int,
+        height: int,
+        data: np.ndarray | None,
+        internal_format: int | Constant,
+        external_format: int | Constant,
+        data_type: int | Constant = GL_UNSIGNED_BYTE,
+    ) -> int:
+        key = (int(width), int(height), int(internal_format))
+        size = self.texture_bytes(width, height, internal_format)
+        free = self.free.get(key)
+        if free:
+            tex = free.pop()
+            self.free_bytes -= size
+            self.reused += 1
+            glBindTexture(GL_TEXTURE_2D, tex)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+            if data is not None:
+                glTexSubImage2D(
+                    GL_TEXTURE_2D, 0, 0, 0, width, height, external_format, data_type, data
+                )
+        else:
+            tex = int(glGenTextures(1))
+            self.allocated += 1
+            glBindTexture(GL_TEXTURE_2D, tex)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+            glTexImage2D(
+                GL_TEXTURE_2D, 0, internal_format, width, height, 0, external_format, data_type, data
+            )
+            self.textures[tex] = (key, size)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        self.live_bytes += size
+        return tex
+
+    def recycle(self, textures: dict):
+        for name, tex in textures.items():
+            if isinstance(tex, PixelBufferRing):
+                tex.delete()
+                continue
+            if name in ("filter", "banded") or not tex:
+                continue
+            owned = self.textures.get(int(tex))
+            if owned is None:
+                glDeleteTextures([tex])
+                continue
+            key, size = owned
+            self.live_bytes -= size
+            if self.free_bytes + size > self.budget_bytes:
+                glDeleteTextures([tex])
+                del self.textures[int(tex)]
+                continue
+            self.free.setdefault(key, []).append(int(tex))
+            self.free_bytes += size
+        textures.clear()
+
+    def clear(self):
+        ids = [tex for free in self.free.values() for tex in free]
+        if ids:
+            glDeleteTextures(ids)
+        for tex in ids:
+            del self.textures[tex]
+        self.free.clear()
+        self.free_bytes = 0
+
+
+# Internal format for each (external format, data type) a video frame plane is uploaded as.
+PLANE_INTERNAL_FORMATS = {
+    (int(GL_RED), int(GL_UNSIGNED_BYTE)): GL_R8,
+    (int(GL_RG), int(GL_UNSIGNED_BYTE)): GL_RG8,
+    (int(GL_RGB), int(GL_UNSIGNED_BYTE)): GL_RGB8,
+    (int(GL_RGBA), int(GL_UNSIGNED_BYTE)): GL_RGBA8,
+    (int(GL_RGBA), int(GL_FLOAT)): GL_RGBA16F,
+}
+
+# (texture, channels, external format) per plane of each UPLOAD_PIXEL_FORMATS frame format.
+_YUV420P_PLANES = (("Y", 1, GL_RED), ("U", 1, GL_RED), ("V", 1, GL_RED))
+FRAME_PLANE_LAYOUTS = {
+    "nv12": (("Y", 1, GL_RED), ("UV", 2, GL_RG)),
+    "yuv420p": _YUV420P_PLANES,
+    "yuvj420p": _YUV420P_PLANES,
+    "gray": (("Y", 1, GL_RED),),
+    "rgba": (("RGB", 4, GL_RGBA),),
+    "rgb24": (("RGB", 3, GL_RGB),),
+}
+
+
+def plane_view(plane: av.video.plane.VideoPlane, channels: int = 1) -> np.ndarray:
+    # A frame plane's pixels in place, each row keeping the decoder's line padding as stride.
+    if channels == 1:
+        return np.ndarray(
+            (plane.height, plane.width), np.uint8, buffer=plane, strides=(plane.line_size, 1)
+        )
+    return np.ndarray(
+        (plane.height, plane.width, channels),
+        np.uint8,
+        buffer=plane,
+        strides=(plane.line_size, channels, 1),
+    )
+
+
+def plane_upload_layout(data: np.ndarray) -> tuple[np.ndarray, int, int]:
+    """
+    (pixels, bytes spanned, GL_UNPACK_ROW_LENGTH) to upload a plane from. Rows padded out to
+    a longer stride are uploaded where they are; any other layout is made contiguous first.
+    """
+    pixel_bytes = data.itemsize * (data.shape[2] if data.ndim == 3 else 1)
+    height, width = data.shape[:2]
+    stride = data.strides[0]
+    if not data[0].flags.c_contiguous or stride < width * pixel_bytes or stride % pixel_bytes:
+        data = np.ascontiguousarray(data)
+        stride = width * pixel_bytes
+    return data, stride * (height - 1) + width * pixel_bytes, stride // pixel_bytes
+
+
+def tex_sub_image(width: int, height: int, external_format, data_type, data: np.ndarray):
+    # Fill the bound texture from client memory without repacking padded rows.
+    data, _, row_length = plane_upload_layout(data)
+    glPixelStorei(GL_UNPACK_ROW_LENGTH, row_length)
+    glTexSubImage2D(
+        GL_TEXTURE_2D, 0, 0, 0, width, height, external_format, data_type, ctypes.c_void_p(data.ctypes.data)
+    )
+    glPixelStorei(GL_UNPACK_ROW_LENGTH, 0)
+
+# Stills bigger than this are uploaded in row bands spread across frames.
+BANDED_UPLOAD_MB = max(0.0, float(os.environ.get("PYPLAY_BANDED_UPLOAD_MB", "16")))
+UPLOAD_BAND_BYTES = 4 * 1024 * 1024
+
+# Pixel unpack buffers per streaming video; 0 uploads straight from client memory.
+PBO_RING_SIZE = max(0, int(os.environ.get("PYPLAY_PBO_COUNT", "2")))
+
+
+class PixelBufferRing:
+    """
+    Streams a video's frames to its textures through a ring of pixel unpack buffers, so the
+    CPU copy of the next frame overlaps with the GPU still reading the previous one.
+    """
+
+    def __init__(self, count: int):
+        self.buffers = [int(buf) for buf in np.atleast_1d(glGenBuffers(count))]
+        self.sizes = [0] * count
+        self.index = 0
+
+    def upload(self, textures: dict, uploads: list[tuple]) -> bool:
+        layouts = [plane_upload_layout(upload[5]) for upload in uploads]
+        offsets = []
+        total = 0
+        for _, span, _ in layouts:
+            offsets.append(total)
+            total += (span + 15) & ~15
+
+        slot = self.index
+        self.index = (self.index + 1) % len(self.buffers)
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, self.buffers[slot])
+        if self.sizes[slot] < total:
+            glBufferData(GL_PIXEL_UNPACK_BUFFER, total, None, GL_STREAM_DRAW)
+            self.sizes[slot] = total
+
+        ptr = glMapBufferRange(
+            GL_PIXEL_UNPACK_BUFFER, 0, total, GL_MAP_WRITE_BIT | GL_MAP_INVALIDATE_BUFFER_BIT
+        )
+        address = ptr if isinstance(ptr, int) else ctypes.cast(ptr, ctypes.c_void_p).value
+        if not address:
+            glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0)
+            return False
+        for (plane, span, _), offset in zip(layouts, offsets):
+            # Padded rows are copied as they are; GL_UNPACK_ROW_LENGTH skips the padding.
+            ctypes.memmove(address + offset, plane.ctypes.data, span)
+        glUnmapBuffer(GL_PIXEL_UNPACK_BUFFER)
+
+        for (name, width, height, external_format, data_type, _), (_, _, row_length), offset in zip(
+            uploads, layouts, offsets
+        ):
+            glBindTexture(GL_TEXTURE_2D, textures[name])
+            glPixelStorei(GL_UNPACK_ROW_LENGTH, row_length)
+            glTexSubImage2D(
+                GL_TEXTURE_2D,
+                0,
+                0,
+                0,
+                width,
+                height,
+                external_format,
+                data_type,
+                ctypes.c_void_p(offset),
+            )
+        glPixelStorei(GL_UNPACK_ROW_LENGTH, 0)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0)
+        return True
+
+    def delete(self):
+        glDeleteBuffers(len(self.buffers), self.buffers)
+        self.buffers = []
+
+
 @dataclass
 class Shader:
     shader: ShaderProgram
@@ -205,6 +475,10 @@ class Renderer:
         self.last_fps_value = 0.0
         self.bloom_w = 0
         self.bloom_h = 0
+        self.texture_pool = TexturePool()
+        self._stream_upload_stats: dict[int, list] = {}
+        self.upload_budget = max(0.0, float(os.environ.get("PYPLAY_UPLOAD_BUDGET_MS", "4"))) / 1000.0
+        self._upload_spent = 0.0
         self.dmx_lookup_texture = 0
         self.dmx_lookup_size = (128, 1)
         self.dmx_lookup_pixels = np.full((1, 128, 4), 255, dtype=np.uint8)
@@ -338,6 +612,8 @@ class Renderer:
         self.VAO = self.setup_geometry(rows=self.warp_mesh[1], cols=self.warp_mesh[0])
         self.setup_postprocess_resources()
         self.setup_dmx_lookup_texture()
+        # Packed RGB8/RGB16F stills have rows that aren't a multiple of 4 bytes.
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
         
         self.src_pts = np.array([[0, 0], [1, 0], [0, 1], [1, 1]], dtype=np.float32)
         self.set_corners([Point(0, 0), Point(1, 0), Point(0, 1), Point(1, 1)], "left")
@@ -364,7 +640,7 @@ class Renderer:
     def render_frame(self, active_cues: list[ActiveCue], capture_frame: bool = False):
         # --- profiling start ---
         frame_start = time.perf_counter()
-        decode_upload_time = 0.0  # total time spent in get_next_frame + update_textures
+        decode_upload_time = 0.0  # total time spent popping decoded frames + update_textures
         texture_create_time = 0.0
         cue_draw_time = 0.0
         framing_time = 0.0
@@ -393,6 +669,9 @@ class Renderer:
             if cue.alpha_video_data:
                 cue.alpha_video_data.release()
 
+        for textures in take_released_textures() + still_cache.take_released_textures():
+            self.texture_pool.recycle(textures)
+
         active_cues[:] = [
             cue for cue in active_cues if not cue.complete
         ]  # Remove completed cues
@@ -413,17 +692,11 @@ class Renderer:
             )
 
             if isinstance(active_cue.cue, VideoCue):
-                if active_cue.video_data.status == VideoStatus.LOADED:
-                    create_start = time.perf_counter()
-                    self.create_textures(active_cue.video_data)
-                    texture_create_time += time.perf_counter() - create_start
-                    active_cue.video_data.status = VideoStatus.READY
-
-                if active_cue.alpha_video_data.status == VideoStatus.LOADED:
-                    create_start = time.perf_counter()
-                    self.create_textures(active_cue.alpha_video_data)
-                    texture_create_time += time.perf_counter() - create_start
-                    active_cue.alpha_video_data.status = VideoStatus.READY
+                for video_data in (active_cue.video_data, active_cue.alpha_video_data):
+                    if video_data.status in (VideoStatus.LOADED, VideoStatus.UPLOADING):
+                        create_start = time.perf_counter()
+                        self.upload_media(video_data)
+                        texture_create_time += time.perf_counter() - create_start
 
                 cue_ready_for_playback = (
                     active_cue.video_data.status == VideoStatus.READY
@@ -437,24 +710,30 @@ class Renderer:
                 if skip_reason is not None:
                     continue
 
-                if (
-                    active_cue.video_data.status == VideoStatus.READY
-                    and active_cue.paused == False
-                    and not active_cue.video_data.still
-                ):
-                    t0 = time.perf_counter()
-                    frame = active_cue.video_data.get_next_frame()
-                    self.update_textures(active_cue.video_data, frame)
-                    decode_upload_time += time.perf_counter() - t0
-
-                if (
-                    active_cue.alpha_video_data.status == VideoStatus.READY
+                streaming = [
+                    video_data
+                    for video_data in (active_cue.video_data, active_cue.alpha_video_data)
+                    if video_data.status == VideoStatus.READY
                     and active_cue.paused == False
-                    and not active_cue.alpha_video_data.still
-                ):
+                    and not video_data.still
+                ]
+                if streaming:
                     t0 = time.perf_counter()
-                    frame = active_cue.alpha_video_data.get_next_frame()
-                    self.update_textures(active_cue.alpha_video_data, frame)
+                    previous_frames = [video_data.current_frame for video_data in streaming]
+                    if len(streaming) == 2:
+                        frames = get_next_frame_pair(
+                            active_cue.video_data,
+                            active_cue.alpha_video_data,
+                            active_cue.media_time(active_cue.video_data),
+                        )
+                    else:
+                        frames = [
+                            video_data.get_next_frame(active_cue.media_time(video_data))
+                            for video_data in streaming
+                        ]
+                    for video_data, frame, previous_frame in zip(streaming, frames, previous_frames):
+                        if frame is not previous_frame:
+                            self.update_textures(video_data, frame)
                     decode_upload_time += time.perf_counter() - t0
 
                 if active_cue.alpha_video_data.status == VideoStatus.EMPTY:
@@ -553,18 +832,12 @@ class Renderer:
 
             self.set_shader(current_shader)
 
-        if self.mask_data:
-            if self.mask_data.status == VideoStatus.LOADED:
-                create_start = time.perf_counter()
-                self.create_textures(self.mask_data)
-                texture_create_time += time.perf_counter() - create_start
-                self.mask_data.status = VideoStatus.READY
-
-                t0 = time.perf_counter()
-                frame = self.mask_data.get_next_frame()
-                self.update_textures(self.mask_data, frame)
-                decode_upload_time += time.perf_counter() - t0
+        if self.mask_data and self.mask_data.status in (VideoStatus.LOADED, VideoStatus.UPLOADING):
+            create_start = time.perf_counter()
+            self.upload_media(self.mask_data)
+            texture_create_time += time.perf_counter() - create_start
 
+        if self.mask_data and self.mask_data.status == VideoStatus.READY:
             # Draw mask
             current_shader = self.current_shader
             self.set_shader("mask")
@@ -593,6 +866,7 @@ class Renderer:
         flip_start = time.perf_counter()
         pygame.display.flip()
         flip_time = time.perf_counter() - flip_start
+        self._upload_spent = 0.0
 
         if self.max_fps > 0:
             self.clock.tick(self.max_fps)
@@ -635,7 +909,10 @@ class Renderer:
                 f"other={max(0.0, other_ms - texture_create_ms - post_ms - setup_ms - cue_draw_ms - mask_ms - framing_ms - warp_ms - flip_ms):6.2f}ms "
                 f"cues={len(active_cues)} video={video_cue_count} still={still_count} alpha={alpha_video_count} "
                 f"post={'on' if self.enable_postprocess else 'off'} bloom_mips={self.bloom_mip_count} "
-                f"warp_mesh={self.warp_mesh[0]}x{self.warp_mesh[1]} scene_scale={self.scene_scale:.2f}"
+                f"warp_mesh={self.warp_mesh[0]}x{self.warp_mesh[1]} scene_scale={self.scene_scale:.2f} "
+                f"vram={self.texture_pool.live_bytes / (1024.0 * 1024.0):.1f}MB "
+                f"pooled={self.texture_pool.free_bytes / (1024.0 * 1024.0):.1f}MB "
+                f"tex_alloc={self.texture_pool.allocated} tex_reuse={self.texture_pool.reused}"
             )
             if self.profile_cues and cue_timings:
                 slowest = sorted(cue_timings, reverse=True)[:3]
@@ -644,9 +921,112 @@ class Renderer:
                     for elapsed, qid, shader in slowest
                 )
                 print(f"[RenderProfile:Cues] {slow_text}")
+            frame_stats = []
+            counted = set()
+            for cue in active_cues:
+                # Cues sharing one stream report its counts once, under the first of them.
+                if isinstance(cue.cue, VideoCue) and id(cue.video_data) not in counted:
+                    counted.add(id(cue.video_data))
+                    frame_stats.append((cue.qid, cue.frame_stats()))
+            frame_text = " ".join(
+                f"qid={qid} dropped={stats['dropped']} late={stats['late']} repeated={stats['repeated']}"
+                for qid, stats in frame_stats
+                if any(stats.values())
+            )
+            if frame_text:
+                # Totals since each cue started; a climbing count marks a stack too heavy to keep up.
+                print(f"[RenderProfile:Frames] {frame_text}")
+            decode_text = []
+            seen = set()
+            for cue in active_cues:
+                if not isinstance(cue.cue, VideoCue):
+                    continue
+                for layer, video_data in (("video", cue.video_data), ("alpha", cue.alpha_video_data)):
+                    if video_data.decode_threads <= 0 or id(video_data) in seen:
+                        continue
+                    seen.add(id(video_data))
+                    frames, seconds = video_data.take_decode_stats()
+                    # Frames per second of decoder time: what the stream could sustain.
+                    decode_fps = frames / seconds if seconds > 0.0 else 0.0
+                    decode_text.append(
+                        f"qid={cue.qid}:{layer} threads={video_data.decode_threads} "
+                        f"decoded={frames} decode_fps={decode_fps:6.1f}"
+                    )
+            if decode_text:
+                print(
+                    f"[RenderProfile:Decode] threads={decode_thread_budget.allocated}/"
+                    f"{decode_thread_budget.total} streams={decode_thread_budget.streams} "
+                    + " ".join(decode_text)
+                )
+            for video_data, stage, count, seconds, bytes_uploaded in self._stream_upload_stats.values():
+                # Average per uploaded frame, comparable with PYPLAY_PBO_COUNT=0.
+                self._log_texture_metric(video_data, stage, seconds / count, bytes_uploaded // count)
+            self._stream_upload_stats.clear()
             self._last_profile_print = frame_end
         return captured_frame
 
+    def prepare_textures(self, video_data: VideoData) -> bool:
+        # Upload a loaded video's first frame ahead of its cue being shown.
+        if video_data.status in (VideoStatus.LOADED, VideoStatus.UPLOADING):
+            create_start = time.perf_counter()
+            self.upload_media(video_data)
+            if video_data.status == VideoStatus.READY and self.profile_render:
+                print(
+                    f"[Standby] Uploaded {video_data.source_path} in "
+                    f"{(time.perf_counter() - create_start) * 1000.0:.2f}ms"
+                )
+        return video_data.status == VideoStatus.READY
+
+    def upload_media(self, video_data: VideoData):
+        if video_data.status == VideoStatus.LOADED:
+            self.create_textures(video_data)
+            if video_data.status == VideoStatus.LOADED and video_data.textures:
+                video_data.status = VideoStatus.READY
+        if video_data.status == VideoStatus.UPLOADING:
+            self.continue_banded_upload(video_data)
+
+    def continue_banded_upload(self, video_data: VideoData):
+        # Always land at least one band so every upload makes progress, then carry on while
+        # this frame's upload budget lasts.
+        upload = video_data.textures["banded"]
+        frame = video_data.current_frame
+        row_bytes = max(1, frame.nbytes // max(1, video_data.height))
+        band_rows = max(1, UPLOAD_BAND_BYTES // row_bytes)
+
+        glBindTexture(GL_TEXTURE_2D, video_data.textures["RGB"])
+        band_time = 0.0
+        while video_data.upload_rows_done < video_data.height:
+            if band_time > 0.0 and self._upload_spent + band_time > self.upload_budget:
+                break
+            band_start = time.perf_counter()
+            row = video_data.upload_rows_done
+            rows = min(band_rows, video_data.height - row)
+            glTexSubImage2D(
+                GL_TEXTURE_2D,
+                0,
+                0,
+                row,
+                video_data.width,
+                rows,
+                upload["external_format"],
+                upload["data_type"],
+                np.ascontiguousarray(frame[row : row + rows]),
+            )
+            video_data.upload_rows_done = row + rows
+            band_time = time.perf_counter() - band_start
+            upload["seconds"] += band_time
+            self._upload_spent += band_time
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+        if video_data.upload_rows_done < video_data.height:
+            return
+
+        del video_data.textures["banded"]
+        video_data.status = VideoStatus.READY
+        self._log_texture_metric(video_data, "create-banded", upload["seconds"], frame.nbytes)
+        if video_data.cache_entry is not None:
+            still_cache.set_textures(video_data.cache_entry, video_data.textures, upload["bytes"])
+
     @staticmethod
     def smooth_step(alpha):
         return alpha * alpha * (3 - 2 * alpha)
@@ -779,7 +1159,20 @@ class Renderer:
                 self.bind_dmx_lookup_texture()
 
         glViewport(0, 0, self.scene_size[0], self.scene_size[1])
-        scissor_box = self.compute_content_scissor(video, shader_parameters)
+        bounds = video.content_bounds_uv
+        if alpha_video and alpha_video.status == VideoStatus.READY and alphaMode == AlphaMode.Alpha:
+            # Outside the matte the layer's alpha is zero, so only shade where both have content.
+            matte = alpha_video.matte_bounds_uv
+            bounds = (
+                max(bounds[0], matte[0]),
+                max(bounds[1], matte[1]),
+                min(bounds[2], matte[2]),
+                min(bounds[3], matte[3]),
+            )
+            if bounds[0] >= bounds[2] or bounds[1] >= bounds[3]:
+                self.maybe_profile_sync()
+                return
+        scissor_box = self.compute_content_scissor(video, shader_parameters, bounds)
         if scissor_box is not None:
             glEnable(GL_SCISSOR_TEST)
             glScissor(*scissor_box)
@@ -794,8 +1187,10 @@ class Renderer:
         self,
         video: VideoData,
         shader_parameters: dict | None = None,
+        bounds: tuple[float, float, float, float] | None = None,
     ) -> tuple[int, int, int, int] | None:
-        bounds = getattr(video, "content_bounds_uv", (0.0, 0.0, 1.0, 1.0))
+        if bounds is None:
+            bounds = getattr(video, "content_bounds_uv", (0.0, 0.0, 1.0, 1.0))
         if bounds == (0.0, 0.0, 1.0, 1.0):
             return None
 
@@ -1203,37 +1598,19 @@ class Renderer:
         else:
             self.set_parameters({"dimmer": 0.0})
 
-    @staticmethod
     def create_texture(
+        self,
         width: int,
         height: int,
-        data: np.ndarray,
+        data: np.ndarray | None,
         internal_format: int | Constant,
         external_format: int | Constant,
         border: list[float],
         data_type: int | Constant = GL_UNSIGNED_BYTE,
     ):
-        tex = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, tex)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
-
-        glTexImage2D(
-            GL_TEXTURE_2D,
-            0,
-            internal_format,
-            width,
-            height,
-            0,
-            external_format,
-            data_type,
-            data,
+        return self.texture_pool.acquire(
+            width, height, data, internal_format, external_format, data_type
         )
-        glBindTexture(GL_TEXTURE_2D, 0)
-
-        return tex
 
     def setup_dmx_lookup_texture(self):
         if self.dmx_lookup_texture:
@@ -1316,34 +1693,87 @@ class Renderer:
             image = np.concatenate([image, alpha], axis=2)
         return image
 
+    @staticmethod
+    def still_texture_format(video_data: VideoData, frame: np.ndarray):
+        # (internal format, external format, data type) for a still held as an ndarray.
+        packed = PYP_GL_FORMATS.get(video_data.pyp_data_type)
+        if packed is not None:
+            return packed[int(video_data.rgba_still)]
+
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+        if channels == 4:
+            external_format = GL_RGBA
+            internal_format = GL_RGBA16F if video_data.hdr_still else GL_RGBA8
+        elif channels == 3:
+            external_format = GL_RGB
+            internal_format = GL_RGB16F if video_data.hdr_still else GL_RGB8
+        else:
+            raise ValueError(f"Unsupported ndarray channel count: {channels}")
+        data_type = (
+            GL_HALF_FLOAT
+            if video_data.hdr_half_still
+            else GL_FLOAT if video_data.hdr_still else GL_UNSIGNED_BYTE
+        )
+        return internal_format, external_format, data_type
+
     def create_textures(self, video_data: VideoData):
+        entry = video_data.cache_entry
+        if entry is not None and entry.textures:
+            if entry.uploading:
+                # Another cue is still uploading this still in bands; stay LOADED until it's done.
+                return
+            # Another cue already uploaded this still; share its textures.
+            video_data.textures = entry.textures
+            return
 
         textures = {}
         textures["filter"] = None  # A cache for the texture's filtering mode (ie: GL_LINEAR or GL_NEAREST).
 
-        frame = video_data.get_next_frame()
+        # Videos already hold their start frame from load; don't skip past it.
+        frame = video_data.current_frame
+        if frame is None:
+            frame = video_data.get_next_frame()
         if frame is None:
             print("create_textures: no frame available, skipping texture creation")
             # Leave video_data.status as LOADED so we can retry next frame
             return
-        
-        
+        if isinstance(frame, SequenceFrame):
+            frame = frame.pixels
 
         if isinstance(frame, np.ndarray):
-            channels = frame.shape[2] if frame.ndim == 3 else 1
-            if channels == 4:
-                external_format = GL_RGBA
-                internal_format = GL_RGBA16F if video_data.hdr_still else GL_RGBA8
-            elif channels == 3:
-                external_format = GL_RGB
-                internal_format = GL_RGB16F if video_data.hdr_still else GL_RGB8
-            else:
-                raise ValueError(f"Unsupported ndarray channel count: {channels}")
-            data_type = (
-                GL_HALF_FLOAT
-                if video_data.hdr_half_still
-                else GL_FLOAT if video_data.hdr_still else GL_UNSIGNED_BYTE
+            internal_format, external_format, data_type = self.still_texture_format(
+                video_data, frame
             )
+            texture_bytes = self._estimate_texture_bytes(frame, data_type)
+            if (
+                BANDED_UPLOAD_MB > 0
+                and video_data.still
+                and frame.nbytes > BANDED_UPLOAD_MB * 1024 * 1024
+            ):
+                # Too big for one frame: allocate now, fill it in bands from upload_media.
+                textures["RGB"] = self.create_texture(
+                    video_data.width,
+                    video_data.height,
+                    None,
+                    internal_format,
+                    external_format,
+                    [0, 0, 0, 1.0],
+                    data_type,
+                )
+                textures["banded"] = {
+                    "external_format": external_format,
+                    "data_type": data_type,
+                    "bytes": texture_bytes,
+                    "seconds": 0.0,
+                }
+                video_data.frame_pix_format = VideoFrameFormat.RGB
+                video_data.textures = textures
+                video_data.upload_rows_done = 0
+                video_data.status = VideoStatus.UPLOADING
+                if entry is not None:
+                    still_cache.begin_upload(entry, textures, texture_bytes)
+                return
+
             upload_start = time.perf_counter()
             textures["RGB"] = self.create_texture(
                 video_data.width,
@@ -1358,124 +1788,41 @@ class Renderer:
                 video_data,
                 "create",
                 time.perf_counter() - upload_start,
-                self._estimate_texture_bytes(frame, data_type),
+                texture_bytes,
             )
             video_data.frame_pix_format = VideoFrameFormat.RGB
             video_data.textures = textures
+            if entry is not None:
+                still_cache.set_textures(entry, textures, texture_bytes)
             return
 
-        frame_format = frame.format.name.lower()
-        float_rgb = self.extract_float_rgb_frame(frame)
-
-        if float_rgb is not None:
-            textures["RGB"] = self.create_texture(
-                video_data.width,
-                video_data.height,
-                float_rgb,
-                GL_RGBA16F,
-                GL_RGBA,
-                [0, 0, 0, 1.0],
-                GL_FLOAT,
-            )
-            video_data.frame_pix_format = VideoFrameFormat.RGB
-        elif frame_format == "nv12":
-            y_plane = np.frombuffer(frame.planes[0], dtype=np.uint8).reshape(
-                video_data.height, video_data.width
-            )
-            uv_raw = np.frombuffer(frame.planes[1], dtype=np.uint8).reshape(
-                video_data.height // 2, video_data.width // 2
-            )
-            uv_plane = uv_raw.reshape(video_data.height // 2, video_data.width // 2)
-            textures["Y"] = self.create_texture(
-                video_data.width,
-                video_data.height,
-                y_plane,
-                GL_R8,
-                GL_RED,
-                [0, 0, 0, 1.0],
-            )
-
-            # UV plane texture (dimensions are width/2 x height/2)
-            textures["UV"] = self.create_texture(
-                video_data.width // 2,
-                video_data.height // 2,
-                uv_plane,
-                GL_RG8,
-                GL_RG,
-                [0.5, 0.5, 0.5, 1.0],
-            )
-            video_data.frame_pix_format = VideoFrameFormat.NV12
-
-        elif "yuv420p" in frame_format or "yuvj420p" in frame_format:
-            planes = ["Y", "U", "V"]
-            for p in range(3):
-                plane = np.frombuffer(frame.planes[p], dtype=np.uint8).reshape(
-                    self.get_video_plane_size(frame, p)
-                )
-                textures[planes[p]] = self.create_texture(
-                    plane.shape[1],
-                    plane.shape[0],
-                    plane,
-                    GL_R8,
-                    GL_RED,
-                    [0, 0, 0, 1.0] if p == 0 else [0.5, 0.5, 0.5, 1.0],
-                )
-
-            video_data.frame_pix_format = VideoFrameFormat.YUVJ420p
-
-        elif "rgba" in frame_format or "rgb" in frame_format:
-            rgba_data = frame.to_ndarray(format="rgba")
-            textures["RGB"] = self.create_texture(
-                video_data.width,
-                video_data.height,
-                rgba_data,
-                GL_RGBA8,
-                GL_RGBA,
-                [0, 0, 0, 1.0],
-            )
-            video_data.frame_pix_format = VideoFrameFormat.RGB
-
-        elif "gray" in frame_format:
-            rgb_data = frame.to_ndarray()
-            textures["Y"] = self.create_texture(
-                video_data.width,
-                video_data.height,
-                rgb_data,
-                GL_R8,
-                GL_RED,
-                [0, 0, 0, 1.0],
-            )
-            video_data.frame_pix_format = VideoFrameFormat.GRAY
-
-        video_data.textures = textures
-
-    @staticmethod
-    def get_video_plane_size(frame: av.VideoFrame, plane: int):
-        (h, w) = (
-            frame.planes[plane].buffer_size // frame.planes[plane].line_size,
-            frame.planes[plane].line_size,
-        )
-
-        return h, w
+        uploads = self.video_frame_uploads(video_data, frame)
+        if uploads is None:
+            video_data.textures = textures
+            return
+        if video_data.packed_matte is not None:
+            uploads, matte_uploads = self.split_packed_uploads(uploads, video_data.alpha_packing)
+            matte_data = video_data.packed_matte
+            self.create_plane_textures(matte_data, matte_uploads)
+            matte_data.colour_space = video_data.colour_space
+            matte_data.status = VideoStatus.READY
+        self.create_plane_textures(video_data, uploads)
 
     def update_textures(self, video_data: VideoData, frame: av.VideoFrame):
 
         if frame is None:
             return
 
-        if isinstance(frame, np.ndarray):
-            channels = frame.shape[2] if frame.ndim == 3 else 1
-            if channels == 4:
-                external_format = GL_RGBA
-            elif channels == 3:
-                external_format = GL_RGB
-            else:
-                raise ValueError(f"Unsupported ndarray channel count: {channels}")
-            data_type = (
-                GL_HALF_FLOAT
-                if video_data.hdr_half_still
-                else GL_FLOAT if video_data.hdr_still else GL_UNSIGNED_BYTE
+        if isinstance(frame, SequenceFrame):
+            _, external_format, data_type = self.still_texture_format(video_data, frame.pixels)
+            self.upload_planes(
+                video_data,
+                [("RGB", video_data.width, video_data.height, external_format, data_type, frame.pixels)],
             )
+            return
+
+        if isinstance(frame, np.ndarray):
+            _, external_format, data_type = self.still_texture_format(video_data, frame)
             upload_start = time.perf_counter()
             glBindTexture(GL_TEXTURE_2D, video_data.textures["RGB"])
             glTexSubImage2D(
@@ -1498,105 +1845,112 @@ class Renderer:
             )
             return
 
-        frame_format = frame.format.name.lower()
+        uploads = self.video_frame_uploads(video_data, frame)
+        if uploads is None:
+            return
+        if video_data.packed_matte is not None:
+            uploads, matte_uploads = self.split_packed_uploads(uploads, video_data.alpha_packing)
+            self.upload_planes(video_data.packed_matte, matte_uploads)
+        self.upload_planes(video_data, uploads)
+
+    def video_frame_uploads(self, video_data: VideoData, frame: av.VideoFrame) -> list[tuple] | None:
+        # (texture name, width, height, external format, data type, pixels) per plane, the
+        # pixels being views of the frame's own buffers rather than copies.
         float_rgb = self.extract_float_rgb_frame(frame)
-
         if float_rgb is not None:
-            glBindTexture(GL_TEXTURE_2D, video_data.textures["RGB"])
-            glTexSubImage2D(
-                GL_TEXTURE_2D,
-                0,
-                0,
-                0,
-                video_data.width,
-                video_data.height,
-                GL_RGBA,
-                GL_FLOAT,
-                float_rgb,
-            )
-            glBindTexture(GL_TEXTURE_2D, 0)
-        elif frame_format == "nv12":
-            y_plane = np.frombuffer(frame.planes[0], dtype=np.uint8).reshape(
-                video_data.height, video_data.width
-            )
-            uv_raw = np.frombuffer(frame.planes[1], dtype=np.uint8).reshape(
-                video_data.height // 2, video_data.width // 2
-            )
-            uv_plane = uv_raw.reshape(video_data.height // 2, video_data.width // 2)
+            video_data.upload_format = frame.format.name
+            return [("RGB", frame.width, frame.height, GL_RGBA, GL_FLOAT, float_rgb)]
+
+        layout = FRAME_PLANE_LAYOUTS.get(frame.format.name)
+        if layout is None:
+            # Stills, and streams opened before negotiation could pick a format.
+            target = negotiate_decode_format(frame.format)
+            layout = FRAME_PLANE_LAYOUTS.get(target)
+            if layout is None:
+                print(f"Unsupported video frame format: '{frame.format.name}'!")
+                return None
+            frame = frame.reformat(format=target)
+
+        video_data.upload_format = frame.format.name
+        return [
+            (name, plane.width, plane.height, external_format, GL_UNSIGNED_BYTE, plane_view(plane, channels))
+            for (name, channels, external_format), plane in zip(layout, frame.planes)
+        ]
 
-            glBindTexture(GL_TEXTURE_2D, video_data.textures["Y"])
-            glTexSubImage2D(
-                GL_TEXTURE_2D,
-                0,
-                0,
-                0,
-                video_data.width,
-                video_data.height,
-                GL_RED,
-                GL_UNSIGNED_BYTE,
-                y_plane,
-            )
-            glBindTexture(GL_TEXTURE_2D, video_data.textures["UV"])
-            glTexSubImage2D(
-                GL_TEXTURE_2D,
-                0,
-                0,
-                0,
-                video_data.width // 2,
-                video_data.height // 2,
-                GL_RG,
-                GL_UNSIGNED_BYTE,
-                uv_plane,
+    @staticmethod
+    def split_packed_uploads(uploads: list[tuple], packing: str) -> tuple[list[tuple], list[tuple]]:
+        # Colour and matte halves of each plane, for frames carrying their matte packed
+        # beside (AlphaPacking.SideBySide) or below (AlphaPacking.Stacked) the picture.
+        colour, matte = [], []
+        for name, width, height, external_format, data_type, data in uploads:
+            if packing == AlphaPacking.Stacked:
+                rows = height // 2
+                colour.append((name, width, rows, external_format, data_type, data[:rows]))
+                matte.append((name, width, rows, external_format, data_type, data[rows : 2 * rows]))
+            else:
+                half = width // 2
+                colour.append((name, half, height, external_format, data_type, data[:, :half]))
+                matte.append((name, half, height, external_format, data_type, data[:, half : 2 * half]))
+        return colour, matte
+
+    def create_plane_textures(self, video_data: VideoData, uploads: list[tuple]):
+        upload_start = time.perf_counter()
+        textures = {"filter": None}
+        for name, width, height, external_format, data_type, data in uploads:
+            textures[name] = self.create_texture(
+                width,
+                height,
+                None,
+                PLANE_INTERNAL_FORMATS[(int(external_format), int(data_type))],
+                external_format,
+                [0.5, 0.5, 0.5, 1.0] if name in ("U", "V", "UV") else [0, 0, 0, 1.0],
+                data_type,
             )
-            glBindTexture(GL_TEXTURE_2D, 0)
-
-        elif "yuv420p" in frame_format or "yuvj420p" in frame_format:
+            glBindTexture(GL_TEXTURE_2D, textures[name])
+            tex_sub_image(width, height, external_format, data_type, data)
+        glBindTexture(GL_TEXTURE_2D, 0)
 
-            planes = ["Y", "U", "V"]
-            for p in range(3):
-                (h, w) = self.get_video_plane_size(frame, p)
-                plane = np.frombuffer(frame.planes[p], dtype=np.uint8).reshape(
-                    self.get_video_plane_size(frame, p)
-                )
-                glBindTexture(GL_TEXTURE_2D, video_data.textures[planes[p]])
-                glTexSubImage2D(
-                    GL_TEXTURE_2D, 0, 0, 0, w, h, GL_RED, GL_UNSIGNED_BYTE, plane
-                )
+        if "UV" in textures:
+            video_data.frame_pix_format = VideoFrameFormat.NV12
+        elif "U" in textures:
+            video_data.frame_pix_format = VideoFrameFormat.YUVJ420p
+        elif "RGB" in textures:
+            video_data.frame_pix_format = VideoFrameFormat.RGB
+        else:
+            video_data.frame_pix_format = VideoFrameFormat.GRAY
+        video_data.textures = textures
+        if self.profile_render:
+            self._log_texture_metric(
+                video_data,
+                f"create-{video_data.upload_format}",
+                time.perf_counter() - upload_start,
+                sum(int(upload[5].nbytes) for upload in uploads),
+            )
 
+    def upload_planes(self, video_data: VideoData, uploads: list[tuple]):
+        textures = video_data.textures
+        ring = textures.get("pbo")
+        if ring is None and PBO_RING_SIZE > 0:
+            ring = textures["pbo"] = PixelBufferRing(PBO_RING_SIZE)
+
+        upload_start = time.perf_counter()
+        if ring is None or not ring.upload(textures, uploads):
+            for name, width, height, external_format, data_type, data in uploads:
+                glBindTexture(GL_TEXTURE_2D, textures[name])
+                tex_sub_image(width, height, external_format, data_type, data)
             glBindTexture(GL_TEXTURE_2D, 0)
 
-        elif "rgba" in frame_format or "rgb" in frame_format:
-            rgba_data = frame.to_ndarray(format="rgba")
-            glBindTexture(GL_TEXTURE_2D, video_data.textures["RGB"])
-            glTexSubImage2D(
-                GL_TEXTURE_2D,
-                0,
-                0,
-                0,
-                video_data.width,
-                video_data.height,
-                GL_RGBA,
-                GL_UNSIGNED_BYTE,
-                rgba_data,
-            )
-            glBindTexture(GL_TEXTURE_2D, 0)
-        elif "gray" in frame_format:
-            rgb_data = frame.to_ndarray()
-            glBindTexture(GL_TEXTURE_2D, video_data.textures["Y"])
-            glTexSubImage2D(
-                GL_TEXTURE_2D,
-                0,
-                0,
-                0,
-                video_data.width,
-                video_data.height,
-                GL_RED,
-                GL_UNSIGNED_BYTE,
-                rgb_data,
+        if self.profile_render:
+            # Per upload path, so e.g. nv12 and padded yuv420p streams can be compared.
+            stage = "update-pbo" if ring else "update"
+            if video_data.upload_format:
+                stage += f"-{video_data.upload_format}"
+            stats = self._stream_upload_stats.setdefault(
+                id(video_data), [video_data, stage, 0, 0.0, 0]
             )
-            glBindTexture(GL_TEXTURE_2D, 0)
-        else:
-            print(f"Unsupported video frame format: '{frame.format.name}'!")
+            stats[2] += 1
+            stats[3] += time.perf_counter() - upload_start
+            stats[4] += sum(int(upload[5].nbytes) for upload in uploads)
 
     def bind_texture_layer(
         self,
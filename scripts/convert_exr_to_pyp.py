@@ -8,7 +8,7 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from pyp_image import read_exr_rgba, write_pyp_image
+from pyp_image import add_pyp_arguments, read_exr_rgba, write_pyp_image
 
 
 def iter_exr_files(inputs: list[str], recursive: bool) -> list[Path]:
@@ -39,6 +39,9 @@ def convert_file(
     overwrite: bool,
     include_alpha: bool,
     black_threshold: float,
+    compression: str | None = None,
+    levels: int = 1,
+    pixel_type: str = "float16",
 ) -> None:
     if destination.exists() and not overwrite:
         print(f"skip  {destination} (already exists)")
@@ -47,14 +50,22 @@ def convert_file(
     image = read_exr_rgba(source)
     destination.parent.mkdir(parents=True, exist_ok=True)
     pixels = image.pixels if include_alpha else image.pixels[..., :3]
-    write_pyp_image(destination, pixels, black_threshold=black_threshold)
+    write_pyp_image(
+        destination,
+        pixels,
+        black_threshold=black_threshold,
+        compression=compression,
+        levels=levels,
+        pixel_type=pixel_type,
+        linear=True,
+    )
     channels = pixels.shape[2] if pixels.ndim == 3 else 1
     print(f"write {source} -> {destination} ({image.width}x{image.height}, {channels}ch)")
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(
-        description="Convert EXR stills to pyPlay's preconverted .pyp float16 format."
+        description="Convert EXR stills to pyPlay's preconverted .pyp format."
     )
     parser.add_argument("inputs", nargs="+", help="EXR files or directories to convert.")
     parser.add_argument(
@@ -79,17 +90,9 @@ def main() -> int:
         action="store_true",
         help="Store RGBA in the output .pyp instead of RGB-only.",
     )
-    parser.add_argument(
-        "--black-threshold",
-        type=float,
-        default=1e-6,
-        help="Threshold used when detecting non-black pixels for content bounds metadata.",
-    )
+    add_pyp_arguments(parser)
     args = parser.parse_args()
 
-    if args.black_threshold < 0.0:
-        parser.error("--black-threshold must be non-negative.")
-
     sources = iter_exr_files(args.inputs, args.recursive)
     if not sources:
         parser.error("No .exr files found in the provided inputs.")
@@ -105,6 +108,9 @@ def main() -> int:
             overwrite=args.overwrite,
             include_alpha=args.alpha,
             black_threshold=args.black_threshold,
+            compression=args.compress,
+            levels=args.levels,
+            pixel_type=args.pixel_type,
         )
 
     return 0
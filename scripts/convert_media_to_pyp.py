@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import hashlib
+import json
+import os
+from pathlib import Path
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import pyp_image
+from pyp_image import add_pyp_arguments, read_exr_rgba, write_pyp_image
+
+SOURCE_SUFFIXES = (".exr", ".png", ".jpg", ".jpeg")
+MANIFEST_NAME = ".pyp_manifest.json"
+
+
+def find_source_for(target: Path) -> Path | None:
+    # A cue pointing at foo.pyp is converted from foo.exr/png/jpg next to it.
+    for suffix in SOURCE_SUFFIXES:
+        for candidate in (target.with_suffix(suffix), target.with_suffix(suffix.upper())):
+            if candidate.is_file():
+                return candidate
+    return None
+
+
+def iter_qproj_media(qproj: Path) -> list[tuple[Path, Path | None]]:
+    from qplayer_config import VideoCue, load_qproj
+
+    base_path = qproj.parent
+    show = load_qproj(str(qproj))
+    pairs: list[tuple[Path, Path | None]] = []
+    for cue in show.cues:
+        if not isinstance(cue, VideoCue):
+            continue
+        for filename in (cue.path, cue.alphaPath):
+            if not filename:
+                continue
+            # Same lookup the player uses (CueEngine.resolve_path).
+            filename = filename.replace("\\", "/")
+            path = Path(filename) if os.path.isfile(filename) else base_path / filename
+            if path.suffix.lower() == ".pyp":
+                source = find_source_for(path)
+                if source is None:
+                    if not path.is_file():
+                        print(f"miss  {path} (no source media next to it)")
+                    continue
+                pairs.append((source, path))
+            elif path.suffix.lower() in SOURCE_SUFFIXES:
+                pairs.append((path, None))
+    return pairs
+
+
+def iter_media_files(inputs: list[str], recursive: bool) -> list[tuple[Path, Path | None]]:
+    pairs: list[tuple[Path, Path | None]] = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            candidates = path.rglob("*") if recursive else path.glob("*")
+            pairs.extend(
+                (file, None)
+                for file in sorted(candidates)
+                if file.is_file() and file.suffix.lower() in SOURCE_SUFFIXES
+            )
+        elif path.suffix.lower() == ".qproj":
+            pairs.extend(iter_qproj_media(path))
+        elif path.suffix.lower() in SOURCE_SUFFIXES:
+            pairs.append((path, None))
+
+    unique: dict[Path, tuple[Path, Path | None]] = {}
+    for source, target in pairs:
+        unique.setdefault((target or source).resolve(), (source, target))
+    return list(unique.values())
+
+
+def build_output_path(source: Path, target: Path | None, output: Path | None) -> Path:
+    if target is not None and output is None:
+        return target
+    name = (target or source.with_suffix(".pyp")).name
+    if output is None:
+        return source.with_suffix(".pyp")
+    return output / name
+
+
+def read_source_rgba(source: Path) -> np.ndarray:
+    if source.suffix.lower() == ".exr":
+        return read_exr_rgba(source).pixels
+
+    import pygame
+
+    surface = pygame.image.load(str(source))
+    width, height = surface.get_size()
+    raw = pygame.image.tobytes(surface, "RGBA", False)
+    rgba = np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 4)
+    return rgba.astype(np.float32) / 255.0
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_stamp(source: Path) -> dict:
+    stat = source.stat()
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def init_worker():
+    # Each process converts its own file; don't also fan PYP3 bands out across every core.
+    pyp_image.PYP_THREADS = 1
+
+
+def convert_one(source: str, destination: str, options: dict) -> dict:
+    start = time.perf_counter()
+    source_path = Path(source)
+    pixels = read_source_rgba(source_path)
+    alpha = options["alpha"]
+    if alpha == "drop" or (alpha == "auto" and np.all(pixels[..., 3] >= 1.0)):
+        pixels = pixels[..., :3]
+
+    destination_path = Path(destination)
+    destination_path.parent.mkdir(parents=True, exist_ok=True)
+    partial = destination_path.with_name(destination_path.name + ".partial")
+    write_pyp_image(
+        partial,
+        pixels,
+        black_threshold=options["black_threshold"],
+        compression=options["compress"],
+        levels=options["levels"],
+        pixel_type=options["pixel_type"],
+        linear=source_path.suffix.lower() == ".exr",
+    )
+    os.replace(partial, destination_path)
+
+    height, width = pixels.shape[:2]
+    return {
+        "sha256": hash_file(source_path),
+        "dims": f"{width}x{height}",
+        "channels": int(pixels.shape[2]),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def load_manifest(path: Path) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path: Path, manifest: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_name(path.name + ".tmp")
+    with open(temp, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    os.replace(temp, path)
+
+
+def is_up_to_date(entry: dict | None, source: Path, destination: Path, options: dict) -> bool:
+    if entry is None or not destination.exists() or entry.get("options") != options:
+        return False
+    stamp = source_stamp(source)
+    if entry.get("mtime_ns") == stamp["mtime_ns"] and entry.get("size") == stamp["size"]:
+        return True
+    # Touched but not changed (eg: copied from another machine): keep the existing output.
+    if entry.get("size") == stamp["size"] and entry.get("sha256") == hash_file(source):
+        entry.update(stamp)
+        return True
+    return False
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Convert EXR/PNG/JPEG stills to pyPlay's .pyp format in parallel, reconverting only "
+            "sources that changed since the last run."
+        )
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Media files, directories, or .qproj show files (converts the media their cues use).",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="Destination directory. Defaults to next to each source (or the .pyp a cue names).",
+    )
+    parser.add_argument(
+        "-r",
+        "--recursive",
+        action="store_true",
+        help="Search input directories recursively.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of files converted at once. Default: CPU count.",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        help=f"Manifest of converted sources. Default: {MANIFEST_NAME} in the output directory, "
+        "or next to the first input.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reconvert everything, ignoring the manifest.",
+    )
+    parser.add_argument(
+        "--alpha",
+        choices=("auto", "keep", "drop"),
+        default="auto",
+        help="Keep the alpha channel; 'auto' drops it when the source is fully opaque.",
+    )
+    add_pyp_arguments(parser)
+    args = parser.parse_args()
+
+    if args.output is not None and args.output.suffix.lower() == ".pyp":
+        parser.error("--output must be a directory.")
+
+    pairs = iter_media_files(args.inputs, args.recursive)
+    if not pairs:
+        parser.error("No convertible media found in the provided inputs.")
+
+    if args.manifest is not None:
+        manifest_path = args.manifest
+    elif args.output is not None:
+        manifest_path = args.output / MANIFEST_NAME
+    else:
+        first = Path(args.inputs[0])
+        manifest_path = (first if first.is_dir() else first.parent) / MANIFEST_NAME
+    manifest = {} if args.force else load_manifest(manifest_path)
+
+    options = {
+        "alpha": args.alpha,
+        "compress": args.compress,
+        "levels": args.levels,
+        "pixel_type": args.pixel_type,
+        "black_threshold": args.black_threshold,
+    }
+
+    jobs: dict[str, Path] = {}
+    skipped = 0
+    for source, target in pairs:
+        destination = build_output_path(source, target, args.output)
+        key = str(destination.resolve())
+        if key in jobs:
+            print(f"error {source}: {destination} is also written from {jobs[key]}")
+            continue
+        if not args.force and is_up_to_date(manifest.get(key), source, destination, options):
+            skipped += 1
+            continue
+        jobs[key] = source
+
+    start = time.perf_counter()
+    failed = 0
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, args.jobs), initializer=init_worker) as pool:
+            futures = {
+                pool.submit(convert_one, str(source), key, options): (key, source)
+                for key, source in jobs.items()
+            }
+            for future in as_completed(futures):
+                key, source = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    failed += 1
+                    print(f"error {source}: {exc}")
+                    continue
+                manifest[key] = {
+                    "source": str(source.resolve()),
+                    "sha256": result["sha256"],
+                    "options": options,
+                    **source_stamp(source),
+                }
+                print(
+                    f"write {source} -> {key} ({result['dims']}, {result['channels']}ch, "
+                    f"{result['seconds']:.1f}s)"
+                )
+    finally:
+        save_manifest(manifest_path, manifest)
+
+    print(
+        f"converted={len(jobs) - failed} skipped={skipped} failed={failed} "
+        f"elapsed={time.perf_counter() - start:.1f}s manifest={manifest_path}"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
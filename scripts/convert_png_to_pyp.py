@@ -11,7 +11,7 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from pyp_image import write_pyp_image
+from pyp_image import add_pyp_arguments, write_pyp_image
 
 
 def iter_png_files(inputs: list[str], recursive: bool) -> list[Path]:
@@ -50,6 +50,9 @@ def convert_file(
     overwrite: bool,
     include_alpha: bool,
     black_threshold: float,
+    compression: str | None = None,
+    levels: int = 1,
+    pixel_type: str = "float16",
 ) -> None:
     if destination.exists() and not overwrite:
         print(f"skip  {destination} (already exists)")
@@ -59,7 +62,14 @@ def convert_file(
     pixels = rgba if include_alpha else rgba[..., :3]
 
     destination.parent.mkdir(parents=True, exist_ok=True)
-    write_pyp_image(destination, pixels, black_threshold=black_threshold)
+    write_pyp_image(
+        destination,
+        pixels,
+        black_threshold=black_threshold,
+        compression=compression,
+        levels=levels,
+        pixel_type=pixel_type,
+    )
 
     height, width = pixels.shape[:2]
     channels = pixels.shape[2] if pixels.ndim == 3 else 1
@@ -68,7 +78,7 @@ def convert_file(
 
 def main() -> int:
     parser = argparse.ArgumentParser(
-        description="Convert PNG stills to pyPlay's preconverted .pyp float16 format."
+        description="Convert PNG stills to pyPlay's preconverted .pyp format."
     )
     parser.add_argument("inputs", nargs="+", help="PNG files or directories to convert.")
     parser.add_argument(
@@ -93,17 +103,9 @@ def main() -> int:
         action="store_true",
         help="Store RGB only in output .pyp, dropping PNG alpha.",
     )
-    parser.add_argument(
-        "--black-threshold",
-        type=float,
-        default=1e-6,
-        help="Threshold used when detecting non-black pixels for content bounds metadata.",
-    )
+    add_pyp_arguments(parser)
     args = parser.parse_args()
 
-    if args.black_threshold < 0.0:
-        parser.error("--black-threshold must be non-negative.")
-
     sources = iter_png_files(args.inputs, args.recursive)
     if not sources:
         parser.error("No .png files found in the provided inputs.")
@@ -121,6 +123,9 @@ def main() -> int:
                 overwrite=args.overwrite,
                 include_alpha=not args.no_alpha,
                 black_threshold=args.black_threshold,
+                compression=args.compress,
+                levels=args.levels,
+                pixel_type=args.pixel_type,
             )
     finally:
         pygame.image.quit()
@@ -8,7 +8,7 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from pyp_image import read_pyp_image, write_exr_rgba
+from pyp_image import decode_pyp_pixels, read_pyp_image, write_exr_rgba
 
 
 def iter_pyp_files(inputs: list[str], recursive: bool) -> list[Path]:
@@ -40,8 +40,9 @@ def convert_file(source: Path, destination: Path, overwrite: bool) -> None:
 
     image = read_pyp_image(source)
     destination.parent.mkdir(parents=True, exist_ok=True)
-    write_exr_rgba(destination, image.pixels)
-    channels = image.pixels.shape[2] if image.pixels.ndim == 3 else 1
+    pixels = decode_pyp_pixels(image.pixels, image.data_type)
+    write_exr_rgba(destination, pixels)
+    channels = pixels.shape[2]
     print(f"write {source} -> {destination} ({image.width}x{image.height}, {channels}ch)")
 
 
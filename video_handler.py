@@ -1,14 +1,112 @@
+import bisect
+from collections import deque
 from enum import IntEnum
+import json
 from typing import Iterator, Optional
 import av
 from av.container import InputContainer, OutputContainer
+import os
 import threading
 import time
 from pathlib import Path
 import numpy as np
 import pygame
 
-from pyp_image import find_content_bounds_uv, read_exr_rgba, read_pyp_image
+from media_cache import DISK_CACHE_DIR, CachedStill, disk_still_cache, still_cache
+from image_sequence import (
+    ImageSequence,
+    SequenceFrame,
+    find_sequence_frames,
+    is_image_sequence,
+    prefault_pixels,
+    read_sequence_frame,
+)
+from media_loader import LOADER_WORKERS, LoadJob, LoadPriority, MediaLoaderPool
+from pyp_image import (
+    PYP_DTYPE_FLOAT16,
+    PYP_DTYPE_R11G11B10F,
+    PYP_DTYPE_SRGB8_A8,
+    find_content_bounds_uv,
+    map_pyp_image,
+    read_exr_rgba,
+)
+
+# Number of decoded frames each video's decode worker keeps ready ahead of presentation.
+DECODE_QUEUE_DEPTH = max(1, int(os.environ.get("PYPLAY_DECODE_QUEUE", "4")))
+# Frames whose PTS is within this many seconds of the media clock count as due.
+PRESENTATION_TOLERANCE = 0.002
+# Scale video frames down to the output size on the decode worker, so less is uploaded.
+# Cues can override this with decodeScale.
+DECODE_DOWNSCALE = os.environ.get("PYPLAY_DECODE_DOWNSCALE", "0").lower() not in ("0", "false", "no", "")
+# Downscaled widths are rounded to this, so planes are unpadded (line_size == width).
+DECODE_WIDTH_ALIGN = 64
+# Codec threads shared by every video decoding at once, and the most any one stream gets.
+DECODE_THREADS = max(1, int(os.environ.get("PYPLAY_DECODE_THREADS", str(os.cpu_count() or 1))))
+DECODE_THREADS_PER_STREAM = max(
+    1, int(os.environ.get("PYPLAY_DECODE_THREADS_PER_STREAM", str(max(1, DECODE_THREADS // 2))))
+)
+# How the decode worker catches up with the presentation clock when it falls behind: "off",
+# "nonref" (stop decoding non-reference frames) or "gop" (also jump ahead to a later keyframe).
+CATCHUP_MODE = os.environ.get("PYPLAY_CATCHUP", "gop").lower()
+# Frame durations behind the clock before non-reference frames are skipped.
+CATCHUP_NONREF_FRAMES = 2
+CATCHUP_GOP_SECONDS = max(0.0, float(os.environ.get("PYPLAY_CATCHUP_GOP_MS", "500"))) / 1000.0
+# Frame formats the renderer uploads straight from the decoder's planes, padded rows and all.
+UPLOAD_PIXEL_FORMATS = ("nv12", "yuv420p", "yuvj420p", "gray", "rgba", "rgb24")
+# Keyframes sampled to find a video's content bounds, 0 to leave videos unscissored.
+VIDEO_BOUNDS_SAMPLES = max(0, int(os.environ.get("PYPLAY_VIDEO_BOUNDS_SAMPLES", "8")))
+# Videos remembered in each on-disk index (keyframes, bounds); least recently used go first.
+DISK_INDEX_ENTRIES = max(1, int(os.environ.get("PYPLAY_DISK_INDEX_ENTRIES", "500")))
+# 8-bit RGB level treated as black, above compression noise in letterbox bars.
+VIDEO_BOUNDS_THRESHOLD = 8
+# Sampled bounds are grown by this fraction of the frame on each side, for content that
+# moves between the sampled frames.
+VIDEO_BOUNDS_MARGIN = 1.0 / 32.0
+
+# Textures of released VideoData, waiting for the render thread to recycle them.
+_released_textures: list[dict] = []
+_released_textures_lock = threading.Lock()
+
+
+class DecodeThreadBudget:
+    """
+    Shares DECODE_THREADS between the videos open at once, so several software decodes
+    don't oversubscribe the CPU. A codec's thread count can't change once it's decoding, so
+    each stream keeps what was free when its decoder opened, always at least one thread.
+    Standby preloads only open theirs once presented (see VideoData.defer_decoder).
+    """
+
+    def __init__(self, total: int = DECODE_THREADS, per_stream: int = DECODE_THREADS_PER_STREAM):
+        self.total = total
+        self.per_stream = per_stream
+        self.allocated = 0
+        self.streams = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> int:
+        with self._lock:
+            threads = max(1, min(self.per_stream, self.total - self.allocated))
+            self.allocated += threads
+            self.streams += 1
+            return threads
+
+    def release(self, threads: int):
+        if threads <= 0:
+            return
+        with self._lock:
+            self.allocated -= threads
+            self.streams -= 1
+
+
+decode_thread_budget = DecodeThreadBudget()
+
+
+def take_released_textures() -> list[dict]:
+    global _released_textures
+    with _released_textures_lock:
+        released = _released_textures
+        _released_textures = []
+        return released
 
 
 def _media_size_mb(path: str) -> float:
@@ -53,6 +151,7 @@ class VideoStatus(IntEnum):
     LOADING = 0
     LOADED = 1
     READY = 2
+    UPLOADING = 3  # Textures allocated, pixels still being uploaded in bands over several frames
     EMPTY = -1
 
 
@@ -75,13 +174,101 @@ class VideoData:
         self.hdr_still = False
         self.hdr_half_still = False
         self.rgba_still = False
+        self.pyp_data_type = 0  # PYP_DTYPE_* of a packed .pyp still, 0 for everything else
         self.content_bounds_uv = (0.0, 0.0, 1.0, 1.0)
+        # Where the value an Alpha-mode matte reads (R, or raw luma) is non-zero.
+        self.matte_bounds_uv = (0.0, 0.0, 1.0, 1.0)
         self.load_kind = ""
         self.load_ms = 0.0
+        self.load_job: Optional[LoadJob] = None
+        # Output size the media will be drawn at; lets .pyp stills load a smaller stored level.
+        self.target_size: Optional[tuple[int, int]] = None
+        # Largest frame size worth decoding to, None for full resolution (see DECODE_DOWNSCALE).
+        self.decode_size: Optional[tuple[int, int]] = None
+        # (width, height) the decode worker rescales frames to, when smaller than the stream.
+        self.scaled_size: Optional[tuple[int, int]] = None
+        # Pixel format the decode worker converts frames to (see negotiate_decode_format).
+        self.decode_format: Optional[str] = None
+        # Frame format the renderer last uploaded, for per-path upload timings.
+        self.upload_format = ""
+        self.upload_rows_done = 0
+        self.cache_entry: Optional[CachedStill] = None
+        self.share_refs = 0
+        # A matte packed into this video's frames (AlphaPacking) is uploaded to packed_matte.
+        self.alpha_packing: Optional[str] = None
+        self.packed_matte: Optional["VideoData"] = None
+        self.frame_queue: deque = deque()
+        self.decode_queue_depth = DECODE_QUEUE_DEPTH
+        self.decode_eof = False
+        self._decode_cond = threading.Condition()
+        self._decode_thread: Optional[threading.Thread] = None
+        # Set to stop the current decode worker; each worker gets its own.
+        self._decode_stop = threading.Event()
+        self._seek_pending: Optional[float] = None
+        self._last_pts: Optional[int] = None
+        self._seek_resume_pts: Optional[int] = None
+        self.start_frame = None
+        self.start_frame_seconds = 0.0
+        self.loop_enabled = False
+        self.loop_end_seconds: Optional[float] = None
+        self._prerolling = False
+        self._preroll_queue: deque = deque()
+        # Media time of the last get_next_frame; image sequences skip frames already behind it.
+        self.presented_time: Optional[float] = None
+        self.catchup_mode = CATCHUP_MODE
+        # Codec threads taken from decode_thread_budget, and decode throughput since the
+        # last take_decode_stats.
+        self.decode_threads = 0
+        # Standby preload: the start frame comes from a one-thread copy of the stream, and the
+        # decoder itself only opens (taking budget threads) when the stream is first presented.
+        self.defer_decoder = False
+        self._decoded_frames = 0
+        self._decode_seconds = 0.0
+        self._skipping_nonref = False
+        self._skipped_late = False
+        # Frames never shown because decoding fell behind (not frames the output rate skips),
+        # shown over a frame late, and frame slots that repeated the previous frame because
+        # the next one wasn't decoded in time.
+        self.dropped_frames = 0
+        self.late_frames = 0
+        self.repeated_frames = 0
+        self._repeat_slot: Optional[tuple[float, int]] = None
+
+    def retain(self) -> "VideoData":
+        # Another cue is showing this same stream; release() only tears down after the last.
+        self.share_refs += 1
+        return self
 
     def release(self):
+        if self.share_refs > 0:
+            self.share_refs -= 1
+            return
+        job = self.load_job
+        if job is not None:
+            self.load_job = None
+            if job.cancel():
+                # Stopped mid-load: the loader is still using the container, so its worker
+                # releases this once load_video returns.
+                return
+        # A running decode worker closes the container itself once it exits.
+        worker_owns_container = self.stop_decoder()
+        decode_thread_budget.release(self.decode_threads)
+        self.decode_threads = 0
+        self.defer_decoder = False
+
+        if self.cache_entry is not None:
+            # Pixels and textures belong to the shared still cache, not to this cue.
+            if self.status == VideoStatus.UPLOADING:
+                still_cache.abandon_upload(self.cache_entry)
+            still_cache.release(self.cache_entry)
+            self.cache_entry = None
+        elif self.textures:
+            with _released_textures_lock:
+                _released_textures.append(self.textures)
+        self.textures = {}
+
         # Close AV container / decoder
-        if self.container is not None:
+        if self.container is not None and not worker_owns_container:
             try:
                 # This tears down the codec + hwaccel context
                 self.container.close()
@@ -93,72 +280,836 @@ class VideoData:
         self.video_stream = None
         self.gen = None
         self.current_frame = None
+        self.start_frame = None
+        self.upload_rows_done = 0
+        self.scaled_size = None
+        self.decode_format = None
+        self.upload_format = ""
+        self.alpha_packing = None
+        self.packed_matte = None
         self.status = VideoStatus.EMPTY
         self.hdr_still = False
         self.hdr_half_still = False
         self.rgba_still = False
+        self.pyp_data_type = 0  # PYP_DTYPE_* of a packed .pyp still, 0 for everything else
         self.content_bounds_uv = (0.0, 0.0, 1.0, 1.0)
+        self.matte_bounds_uv = (0.0, 0.0, 1.0, 1.0)
         self.load_kind = ""
         self.load_ms = 0.0
+        self.dropped_frames = 0
+        self.late_frames = 0
+        self.repeated_frames = 0
+        self._repeat_slot = None
+
+    def frame_stats(self) -> dict[str, int]:
+        # Image sequences skip late frame reads themselves.
+        sequence_dropped = getattr(self.container, "dropped_frames", 0) if self.container else 0
+        return {
+            "dropped": self.dropped_frames + sequence_dropped,
+            "late": self.late_frames,
+            "repeated": self.repeated_frames,
+        }
+
+    def take_decode_stats(self) -> tuple[int, float]:
+        # (frames decoded, seconds spent decoding them) since the last call.
+        with self._decode_cond:
+            stats = (self._decoded_frames, self._decode_seconds)
+            self._decoded_frames = 0
+            self._decode_seconds = 0.0
+        return stats
+
+    def memory_bytes(self) -> int:
+        frame = self.current_frame
+        if isinstance(frame, np.ndarray):
+            return int(frame.nbytes)
+        if isinstance(frame, SequenceFrame):
+            return int(frame.pixels.nbytes) * (self.decode_queue_depth + 1)
+        if self.width <= 0 or self.height <= 0:
+            return 0
+        # 8-bit 4:2:0 frames for whatever the decode worker holds ahead.
+        return int(self.width * self.height * 1.5) * (self.decode_queue_depth + 1)
 
-    def get_next_frame(self):
+    def get_next_frame(self, media_time: Optional[float] = None):
         if self.still:
             if self.current_frame is None:
                 frame = next(self.gen)
             else:
                 frame = self.current_frame
         else:
-            try:
-                if self.gen is not None:
-                    frame = next(self.gen)
-                else:
-                    frame = None
-
-            except StopIteration:
-                frame = self.current_frame
-                self.still = True
-                # frame = self.seek_start()
-
-            except Exception as e:
-                # Transient decode error: don't crash, don't blank
-                print(f"Decode error: {e} – freezing on last frame")
-
+            # Never decode on the caller's thread: take whatever the decode worker has ready
+            # and repeat the last frame if it hasn't caught up yet. With a media time, the
+            # newest frame due by then is shown and any older ones are dropped unseen.
+            if self.defer_decoder and self._decode_thread is None and self.container is not None:
+                self._start_presenting()
+            previous_time = self.presented_time
+            if media_time is not None:
+                self.presented_time = media_time
+            frame = self._pop_decoded_frame(media_time, previous_time)
+            if frame is None:
+                if self.decode_eof and not self.frame_queue:
+                    self.still = True
+                elif media_time is not None:
+                    self._count_repeat(media_time)
                 frame = self.current_frame
 
         self.current_frame = frame
         return frame
 
+    def decoded_until(self, media_time: float) -> Optional[float]:
+        """
+        How far towards media_time this stream can be shown without waiting on its decoder:
+        media_time itself when caught up, or the newest decoded frame's time when behind.
+        """
+        with self._decode_cond:
+            if self.decode_eof and not self.frame_queue:
+                return media_time
+            newest = None
+            for frame in self.frame_queue:
+                seconds = frame_seconds(frame)
+                if seconds > media_time + PRESENTATION_TOLERANCE:
+                    return media_time
+                newest = seconds
+        if newest is None:
+            if self.current_frame is None:
+                return None
+            newest = frame_seconds(self.current_frame)
+        # The frame after the newest one isn't decoded yet, but it may not be due yet either.
+        if newest + self.frame_duration() > media_time + PRESENTATION_TOLERANCE:
+            return media_time
+        return newest
+
+    def frame_duration(self) -> float:
+        stream = self.video_stream
+        rate = (stream.average_rate or stream.guessed_rate) if stream is not None else None
+        return 1.0 / float(rate) if rate else 0.0
+
+    def _count_repeat(self, media_time: float):
+        # Once per frame slot that passes with the previous frame still up.
+        duration = self.frame_duration()
+        if duration <= 0.0 or self.current_frame is None:
+            return
+        shown = frame_seconds(self.current_frame)
+        slots = int((media_time + PRESENTATION_TOLERANCE - shown) / duration)
+        if slots >= 1 and self._repeat_slot != (shown, slots):
+            self._repeat_slot = (shown, slots)
+            self.repeated_frames += 1
+
     def seek_start(self):
-        if not self.still and self.status in (
+        if self._decode_thread is not None and self.status in (
             VideoStatus.LOADING,
             VideoStatus.LOADED,
             VideoStatus.READY,
         ):
-            frame = seek_to_time(
-                self.container, self.video_stream, self.seek_start_seconds
-            )
+            with self._decode_cond:
+                self.frame_queue.clear()
+                self._preroll_queue.clear()
+                self._prerolling = False
+                self.decode_eof = False
+                # Re-go: the start frame is already decoded, so it can be shown on the
+                # next render while the worker seeks to continue after it.
+                self._request_start_seek(self.frame_queue)
+                self._decode_cond.notify_all()
+            # Reaching the end froze the video; a seek brings it back to life.
+            self.still = False
+            frame = self.current_frame
+        elif not self.still and self.status in (
+            VideoStatus.LOADING,
+            VideoStatus.LOADED,
+            VideoStatus.READY,
+        ):
+            frame = self._seek_start_frame()
+            if frame is not None:
+                frame = self._convert_frame(frame)
+                self.start_frame = frame
+                self.start_frame_seconds = self.seek_start_seconds
         else:
             frame = self.current_frame
 
         return frame
 
+    def _seek_start_frame(self):
+        keyframes = lookup_keyframe_index(self.source_path) if self.source_path else None
+        if not self.defer_decoder:
+            return seek_to_time(self.container, self.video_stream, self.seek_start_seconds, keyframes)
+        with open_video_container(self.source_path) as container:
+            stream = container.streams.video[0]
+            stream.codec_context.thread_count = 1
+            return seek_to_time(container, stream, self.seek_start_seconds, keyframes)
+
+    def open_decoder(self):
+        # Frame and slice threads, sized from what the other open videos leave free.
+        self.decode_threads = decode_thread_budget.acquire()
+        codec_context = self.video_stream.codec_context
+        codec_context.thread_type = "AUTO"
+        codec_context.thread_count = self.decode_threads
+
+    def _start_presenting(self):
+        # A deferred standby is going live: open its decoder and have the worker continue
+        # after the start frame it already shows.
+        self.defer_decoder = False
+        self.open_decoder()
+        with self._decode_cond:
+            self._request_start_seek(self.frame_queue)
+        self.start_decoder()
+
+    def set_loop(self, enabled: bool, end_seconds: Optional[float] = None):
+        if enabled == self.loop_enabled and end_seconds == self.loop_end_seconds:
+            return
+
+        with self._decode_cond:
+            self.loop_enabled = enabled
+            self.loop_end_seconds = end_seconds
+            self._decode_cond.notify_all()
+
+    def wrap_loop(self):
+        self.presented_time = None
+        with self._decode_cond:
+            if self._prerolling:
+                # The next pass is already decoded from its first frame; swap it in so the
+                # wrap costs no more than an ordinary frame.
+                self.frame_queue.clear()
+                self.frame_queue.extend(self._preroll_queue)
+                self._preroll_queue.clear()
+                self._prerolling = False
+                self.decode_eof = False
+                self.still = False
+                self._decode_cond.notify_all()
+                return
+
+        self.seek_start()
+
+    def presentation_clock(self) -> Optional[float]:
+        # While the next loop pass prerolls, its frames are early rather than late.
+        return None if self._prerolling else self.presented_time
+
+    def _request_start_seek(self, queue: deque):
+        self.presented_time = None
+        self._seek_pending = self.seek_start_seconds
+        self._seek_resume_pts = None
+        if self.start_frame is not None and self.start_frame_seconds == self.seek_start_seconds:
+            queue.append(self.start_frame)
+            self._seek_resume_pts = self.start_frame.pts
+
+    def _decode_target_queue(self) -> deque:
+        return self._preroll_queue if self._prerolling else self.frame_queue
+
+    def _reached_loop_end(self, frame) -> bool:
+        if not self.loop_enabled or self._prerolling:
+            return False
+        if frame is None:
+            return True
+        return self.loop_end_seconds is not None and frame_seconds(frame) >= self.loop_end_seconds
+
+    def _begin_loop_preroll(self):
+        # Start decoding the next pass while the current one is still draining, so the
+        # loop head is ready before CueEngine.tick wraps the clock.
+        self._prerolling = True
+        self._preroll_queue.clear()
+        self._request_start_seek(self._preroll_queue)
+
+    def start_decoder(self):
+        if self.still or self.container is None or self._decode_thread is not None:
+            return
+
+        self._decode_stop = threading.Event()
+        self.decode_eof = False
+        self._decode_thread = threading.Thread(
+            target=self._decode_worker,
+            args=(self.container, self.video_stream, self._decode_stop),
+            name=f"decode:{Path(self.source_path).name}",
+            daemon=True,
+        )
+        self._decode_thread.start()
+
+    def stop_decoder(self) -> bool:
+        """
+        Asks the decode worker to stop without waiting for it: it may be inside a long
+        decode or seek. Returns True if there was a worker, which then closes the container.
+        """
+        thread = self._decode_thread
+        if thread is None:
+            return False
+
+        with self._decode_cond:
+            self._decode_stop.set()
+            self._decode_cond.notify_all()
+        self._decode_thread = None
+        self._seek_pending = None
+        self._prerolling = False
+        self.frame_queue.clear()
+        self._preroll_queue.clear()
+        return True
+
+    def _pop_decoded_frame(
+        self, media_time: Optional[float] = None, previous_time: Optional[float] = None
+    ):
+        with self._decode_cond:
+            if media_time is None:
+                frame = self.frame_queue.popleft() if self.frame_queue else None
+            else:
+                frame = None
+                while (
+                    self.frame_queue
+                    and frame_seconds(self.frame_queue[0]) <= media_time + PRESENTATION_TOLERANCE
+                ):
+                    # Only a frame that was already due at the previous presentation was
+                    # dropped for lateness; one that fell between two renders is just the
+                    # output rate being lower than the video's (eg: 50 fps on 30 Hz).
+                    if frame is not None and previous_time is not None and frame_seconds(
+                        frame
+                    ) <= previous_time + PRESENTATION_TOLERANCE:
+                        self.dropped_frames += 1
+                    frame = self.frame_queue.popleft()
+                if frame is not None and media_time - frame_seconds(frame) > max(
+                    self.frame_duration(), PRESENTATION_TOLERANCE
+                ):
+                    self.late_frames += 1
+            if frame is not None:
+                self._decode_cond.notify_all()
+            return frame
+
+    def _catch_up(self, container, stream):
+        """
+        Runs on the decode worker before each frame. When decoding has fallen behind the
+        presentation clock, stop decoding non-reference frames; when it is more than
+        CATCHUP_GOP_SECONDS behind, jump to the last keyframe before the clock.
+        """
+        codec = getattr(stream, "codec_context", None)
+        clock = self.presentation_clock()
+        behind = 0.0
+        if (
+            codec is not None
+            and clock is not None
+            and self.catchup_mode in ("nonref", "gop")
+            and self._last_pts is not None
+        ):
+            behind = clock - float(self._last_pts * stream.time_base)
+
+        skip = behind > CATCHUP_NONREF_FRAMES * self.frame_duration()
+        if skip != self._skipping_nonref:
+            codec.skip_frame = "NONREF" if skip else "DEFAULT"
+            self._skipping_nonref = skip
+
+        if self.catchup_mode != "gop" or behind <= CATCHUP_GOP_SECONDS:
+            return
+        keyframes = lookup_keyframe_index(self.source_path)
+        if not keyframes:
+            return
+        start_pts = stream.start_time or 0
+        index = bisect.bisect_right(keyframes, int(clock / stream.time_base) + start_pts) - 1
+        if index < 0 or keyframes[index] - start_pts <= self._last_pts:
+            return
+        container.seek(keyframes[index], stream=stream, any_frame=False, backward=True)
+        self.gen = decode_frames(container, stream)
+
+    def _behind_clock(self, frame) -> bool:
+        # The frame after this one is already due, so this one could only be dropped unseen.
+        clock = self.presentation_clock()
+        if clock is None or frame.pts is None:
+            return False
+        return frame_seconds(frame) + self.frame_duration() <= clock
+
+    def _count_skipped(self, frame, previous_pts: Optional[int]):
+        # Frames the decoder left out while catching up show as gaps in the PTS sequence.
+        duration = self.frame_duration()
+        if not self._skipping_nonref or previous_pts is None or frame.pts is None or duration <= 0.0:
+            return
+        gap = float((frame.pts - previous_pts) * self.video_stream.time_base) / duration
+        if gap > 1.5:
+            self.dropped_frames += int(round(gap)) - 1
+
+    def _convert_frame(self, frame):
+        if frame is None or (self.scaled_size is None and self.decode_format is None):
+            return frame
+        width, height = self.scaled_size or (frame.width, frame.height)
+        return frame.reformat(
+            width=width, height=height, format=self.decode_format, interpolation="AREA"
+        )
+
+    def _stamp_missing_pts(self, frame):
+        # The presentation clock schedules by PTS, so synthesise one from the stream rate
+        # for the odd container that doesn't provide it.
+        stream = self.video_stream
+        if stream is None or stream.time_base is None:
+            return
+        if frame.pts is not None:
+            self._last_pts = frame.pts
+            return
+
+        rate = stream.average_rate or stream.guessed_rate
+        if not rate:
+            return
+        step = max(1, int(round(1.0 / (float(rate) * float(stream.time_base)))))
+        frame.pts = 0 if self._last_pts is None else self._last_pts + step
+        frame.time_base = stream.time_base
+        self._last_pts = frame.pts
+
+    def _decode_worker(self, container, stream, stop: threading.Event):
+        # The worker holds its own references, so release() never closes the container
+        # while a decode or seek is still running on it.
+        try:
+            self._decode_loop(container, stream, stop)
+        finally:
+            try:
+                container.close()
+            except Exception as e:
+                print(f"[Decode] Error closing container: {e}")
+
+    def _decode_loop(self, container, stream, stop: threading.Event):
+        while True:
+            with self._decode_cond:
+                while (
+                    not stop.is_set()
+                    and self._seek_pending is None
+                    and (
+                        self.decode_eof
+                        or len(self._decode_target_queue()) >= self.decode_queue_depth
+                    )
+                ):
+                    self._decode_cond.wait()
+                if stop.is_set():
+                    return
+                seek_seconds = self._seek_pending
+                self._seek_pending = None
+
+            if seek_seconds is not None:
+                if self._skipping_nonref:
+                    # A seek decodes up to its exact target, which may be a non-reference frame.
+                    stream.codec_context.skip_frame = "DEFAULT"
+                    self._skipping_nonref = False
+                try:
+                    frame, self.gen = seek_decode(
+                        container,
+                        stream,
+                        seek_seconds,
+                        lookup_keyframe_index(self.source_path),
+                    )
+                except Exception as e:
+                    print(f"[Decode] Seek failed: {e}")
+                    frame = None
+                    self.gen = None
+                resume_pts = self._seek_resume_pts
+                if frame is not None and resume_pts is not None and frame.pts <= resume_pts:
+                    # Already queued from the cached start frame.
+                    with self._decode_cond:
+                        self._seek_resume_pts = None
+                    continue
+            else:
+                try:
+                    self._catch_up(container, stream)
+                    decode_start = time.perf_counter()
+                    frame = next(self.gen) if self.gen is not None else None
+                    decode_seconds = time.perf_counter() - decode_start
+                except StopIteration:
+                    frame = None
+                except Exception as e:
+                    # Transient decode error: don't crash, don't blank
+                    print(f"[Decode] Decode error: {e} – skipping frame")
+                    continue
+
+            # A frame the clock has already passed would be dropped unseen, so don't spend a
+            # conversion on it. Never two in a row, so a stream that can't keep up still shows
+            # every other frame rather than freezing until catch-up jumps ahead.
+            late = (
+                frame is not None
+                and seek_seconds is None
+                and not self._skipped_late
+                and self._behind_clock(frame)
+            )
+            self._skipped_late = late
+            if frame is not None and not late:
+                try:
+                    frame = self._convert_frame(frame)
+                except Exception as e:
+                    print(f"[Decode] Convert error: {e} – skipping frame")
+                    continue
+
+            with self._decode_cond:
+                if stop.is_set():
+                    return
+                if self._seek_pending is not None:
+                    # A newer seek arrived while decoding; this frame is stale.
+                    continue
+                if frame is not None:
+                    previous_pts = self._last_pts
+                    self._stamp_missing_pts(frame)
+                    if seek_seconds is None:
+                        self._count_skipped(frame, previous_pts)
+                        self._decoded_frames += 1
+                        self._decode_seconds += decode_seconds
+                if self._reached_loop_end(frame):
+                    self._begin_loop_preroll()
+                elif late:
+                    self.dropped_frames += 1
+                elif frame is None:
+                    self.decode_eof = True
+                else:
+                    self._decode_target_queue().append(frame)
+                self._decode_cond.notify_all()
+
+
+def get_next_frame_pair(video_data: VideoData, matte_data: VideoData, media_time: float):
+    """
+    Advances a video and its alpha matte in lock-step, so a colour frame is only ever shown
+    with the matte frame for the same time. If either decode worker falls behind, both hold
+    their current frames until the pair is complete.
+    """
+    ready = [stream.decoded_until(media_time) for stream in (video_data, matte_data)]
+    if None in ready:
+        video_data._count_repeat(media_time)
+        matte_data._count_repeat(media_time)
+        return video_data.current_frame, matte_data.current_frame
+    target = min(ready)
+    return video_data.get_next_frame(target), matte_data.get_next_frame(target)
+
+
+def frame_seconds(frame) -> float:
+    if frame is None:
+        return 0.0
+    frame_time = frame.time
+    if frame_time is None:
+        return 0.0
+    return float(frame_time)
+
+
+def media_file_key(path: str) -> tuple[str, int, int] | None:
+    try:
+        resolved = Path(path).resolve()
+        stat = resolved.stat()
+    except OSError:
+        return None
+    return (str(resolved), stat.st_mtime_ns, stat.st_size)
+
+
+# Keyframe indexes and video bounds are kept on disk between runs, keyed on media_file_key.
+_keyframe_index_cache: dict[str, list[int]] | None = None
+_keyframe_index_lock = threading.Lock()
+_keyframe_index_building: set[tuple[str, int, int]] = set()
+_KEYFRAME_INDEX_FILE = Path(DISK_CACHE_DIR) / "keyframe_index.json"
+
+
+def _disk_cache_key(key: tuple[str, int, int]) -> str:
+    return f"{key[0]}|{key[1]}|{key[2]}"
+
+
+def _use_json_cache(entries: dict[str, list], cache_key: str) -> Optional[list]:
+    # Entries are kept least recently used first; the order is saved with the next update.
+    value = entries.pop(cache_key, None)
+    if value is not None:
+        entries[cache_key] = value
+    return value
+
+
+def _store_json_cache(entries: dict[str, list], cache_key: str, value: list) -> None:
+    # Older versions of the same source can never match again.
+    prefix = cache_key.rsplit("|", 2)[0] + "|"
+    for stale in [key for key in entries if key.startswith(prefix)]:
+        del entries[stale]
+    entries[cache_key] = value
+    while len(entries) > DISK_INDEX_ENTRIES:
+        del entries[next(iter(entries))]
 
-def seek_to_time(container, stream, target_time):
-    # Convert time in seconds to PTS (presentation timestamp)
+
+def _load_json_cache(path: Path) -> dict[str, list]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_json_cache(path: Path, entries: dict[str, list], tag: str) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(path.name + ".tmp")
+        temp.write_text(json.dumps(entries), encoding="utf-8")
+        os.replace(temp, path)
+    except OSError as e:
+        print(f"[{tag}] Could not save {path}: {e}")
+
+
+def _load_keyframe_index_locked() -> dict[str, list[int]]:
+    global _keyframe_index_cache
+    if _keyframe_index_cache is None:
+        _keyframe_index_cache = _load_json_cache(_KEYFRAME_INDEX_FILE)
+    return _keyframe_index_cache
+
+
+def build_keyframe_index(path: str, stream_index: int = 0) -> list[int]:
+    # Demux only (no decode) and record the PTS of every keyframe packet.
+    keyframes = []
+    with av.open(path) as container:
+        stream = container.streams.video[stream_index]
+        for packet in container.demux(stream):
+            if packet.is_keyframe and packet.pts is not None:
+                keyframes.append(packet.pts)
+    keyframes.sort()
+    return keyframes
+
+
+def lookup_keyframe_index(path: str) -> list[int] | None:
+    key = media_file_key(path)
+    if key is None:
+        return None
+    with _keyframe_index_lock:
+        return _use_json_cache(_load_keyframe_index_locked(), _disk_cache_key(key))
+
+
+def get_keyframe_index(path: str) -> list[int] | None:
+    key = media_file_key(path)
+    if key is None:
+        return None
+
+    with _keyframe_index_lock:
+        keyframes = _use_json_cache(_load_keyframe_index_locked(), _disk_cache_key(key))
+        if keyframes is not None or key in _keyframe_index_building:
+            return keyframes
+        _keyframe_index_building.add(key)
+
+    index_start = time.perf_counter()
+    try:
+        keyframes = build_keyframe_index(path)
+        print(
+            f"[KeyframeIndex] keyframes={len(keyframes)} "
+            f"build_ms={(time.perf_counter() - index_start) * 1000.0:.2f} path={path}"
+        )
+    except Exception as e:
+        print(f"[KeyframeIndex] Failed to index {path}: {e}")
+        keyframes = None
+
+    with _keyframe_index_lock:
+        _keyframe_index_building.discard(key)
+        if keyframes is not None:
+            entries = _load_keyframe_index_locked()
+            _store_json_cache(entries, _disk_cache_key(key), keyframes)
+            _save_json_cache(_KEYFRAME_INDEX_FILE, entries, "KeyframeIndex")
+    return keyframes
+
+
+def get_keyframe_index_async(path: str, pool: Optional[MediaLoaderPool]) -> None:
+    # Without a pool (eg: a direct load_video call) the video just seeks without an index.
+    if pool is None or lookup_keyframe_index(path) is not None:
+        return
+    pool.submit_task(f"keyframe-index:{path}", lambda: get_keyframe_index(path))
+
+
+_video_bounds_cache: dict[str, list] | None = None
+_video_bounds_lock = threading.Lock()
+_video_bounds_building: set[tuple[str, int, int]] = set()
+_VIDEO_BOUNDS_FILE = Path(DISK_CACHE_DIR) / "video_bounds.json"
+
+BoundsUV = tuple[float, float, float, float]
+
+
+def _load_video_bounds_locked() -> dict[str, list]:
+    global _video_bounds_cache
+    if _video_bounds_cache is None:
+        _video_bounds_cache = _load_json_cache(_VIDEO_BOUNDS_FILE)
+    return _video_bounds_cache
+
+
+def _matte_values(frame, rgb: np.ndarray) -> np.ndarray:
+    # What an Alpha-mode matte samples: R for RGB media, otherwise the luma plane as stored.
+    if frame.format.is_rgb:
+        return rgb[..., 0]
+    plane = frame.planes[0]
+    dtype = np.dtype(np.uint8) if frame.format.components[0].bits <= 8 else np.dtype("<u2")
+    values = np.frombuffer(plane, dtype=dtype).reshape(plane.height, plane.line_size // dtype.itemsize)
+    return values[:, : plane.width]
+
+
+def _union_bounds(a: BoundsUV | None, b: BoundsUV) -> BoundsUV:
+    if a is None:
+        return b
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _pad_bounds(bounds: BoundsUV | None) -> BoundsUV:
+    if bounds is None:
+        return (0.0, 0.0, 1.0, 1.0)
+    return (
+        max(0.0, bounds[0] - VIDEO_BOUNDS_MARGIN),
+        max(0.0, bounds[1] - VIDEO_BOUNDS_MARGIN),
+        min(1.0, bounds[2] + VIDEO_BOUNDS_MARGIN),
+        min(1.0, bounds[3] + VIDEO_BOUNDS_MARGIN),
+    )
+
+
+def probe_video_bounds(path: str, samples: int = VIDEO_BOUNDS_SAMPLES) -> tuple[BoundsUV, BoundsUV]:
+    # (content, matte) bounds: the union over keyframes spread through the video.
+    content = None
+    matte = None
+    keyframes = get_keyframe_index(path) or []
+    with av.open(path) as container:
+        stream = container.streams.video[0]
+        # Runs beside playing videos, outside decode_thread_budget, so stays on one thread.
+        stream.codec_context.thread_count = 1
+        duration = float(stream.duration * stream.time_base) if stream.duration else 0.0
+        if not duration and container.duration:
+            duration = container.duration / av.time_base
+        start_pts = stream.start_time or 0
+        has_alpha = any(component.is_alpha for component in stream.format.components)
+        gen = None
+        frame = None
+        for index in range(max(1, samples)):
+            target_pts = start_pts + int(duration * index / max(1, samples) / stream.time_base)
+            keyframe = keyframes[max(0, bisect.bisect_right(keyframes, target_pts) - 1)] if keyframes else None
+            # Keep decoding forward when the target is in the GOP we're already in.
+            if gen is None or frame is None or keyframe is None or keyframe > frame.pts:
+                container.seek(target_pts, stream=stream, any_frame=False, backward=True)
+                gen = container.decode(stream)
+            frame = None
+            for candidate in gen:
+                frame = candidate
+                if candidate.pts is None or candidate.pts >= target_pts:
+                    break
+            if frame is None:
+                break
+            rgb = frame.to_ndarray(format="rgba" if has_alpha else "rgb24")
+            frame_content = find_content_bounds_uv(rgb, threshold=VIDEO_BOUNDS_THRESHOLD)
+            frame_matte = find_content_bounds_uv(_matte_values(frame, rgb), threshold=0)
+            content = _union_bounds(content, frame_content)
+            matte = _union_bounds(matte, frame_matte)
+    return _pad_bounds(content), _pad_bounds(matte)
+
+
+def get_video_bounds(path: str) -> tuple[BoundsUV, BoundsUV] | None:
+    key = media_file_key(path)
+    if key is None:
+        return None
+    cache_key = _disk_cache_key(key)
+
+    with _video_bounds_lock:
+        cached = _use_json_cache(_load_video_bounds_locked(), cache_key)
+        if cached is not None:
+            return tuple(cached[0]), tuple(cached[1])
+        if key in _video_bounds_building:
+            return None
+        _video_bounds_building.add(key)
+
+    probe_start = time.perf_counter()
     try:
-        target_pts = int(target_time / stream.time_base)
+        bounds = probe_video_bounds(path)
+        print(
+            f"[VideoBounds] content={tuple(round(v, 3) for v in bounds[0])} "
+            f"matte={tuple(round(v, 3) for v in bounds[1])} "
+            f"probe_ms={(time.perf_counter() - probe_start) * 1000.0:.2f} path={path}"
+        )
+    except Exception as e:
+        print(f"[VideoBounds] Failed to probe {path}: {e}")
+        bounds = None
+
+    with _video_bounds_lock:
+        _video_bounds_building.discard(key)
+        if bounds is not None:
+            entries = _load_video_bounds_locked()
+            _store_json_cache(entries, cache_key, [list(bounds[0]), list(bounds[1])])
+            _save_json_cache(_VIDEO_BOUNDS_FILE, entries, "VideoBounds")
+    return bounds
+
+
+def get_video_bounds_async(path: str, video_data: VideoData, pool: Optional[MediaLoaderPool]) -> None:
+    if VIDEO_BOUNDS_SAMPLES <= 0 or pool is None:
+        return
+
+    def apply():
+        bounds = get_video_bounds(path)
+        # The VideoData may have been released and reused while probing.
+        if bounds is not None and video_data.source_path == path:
+            video_data.content_bounds_uv, video_data.matte_bounds_uv = bounds
+
+    pool.submit_task(f"video-bounds:{path}", apply)
+
+
+def decode_frames(container, stream) -> Iterator[av.VideoFrame]:
+    """
+    Decodes stream with its start_time taken off every frame's PTS, so frame times count
+    from the first frame like a cue's media clock (MPEG-TS and edit-listed MP4/MOV files
+    often start later than 0). Seeks and the keyframe index stay in stream PTS.
+    """
+    start_pts = stream.start_time or 0
+    for frame in container.decode(stream):
+        if start_pts and frame.pts is not None:
+            frame.pts -= start_pts
+        yield frame
 
+
+def seek_decode(container, stream, target_time, keyframes: list[int] | None = None):
+    # Convert media time in seconds to PTS (presentation timestamp)
+    target_pts = int(target_time / stream.time_base)
+    start_pts = stream.start_time or 0
+
+    if keyframes:
+        # Jump straight to the keyframe at or before the target; if the target is a
+        # keyframe (the usual case for cue start times) no extra frames are decoded.
+        index = max(0, bisect.bisect_right(keyframes, target_pts + start_pts) - 1)
+        seek_pts = keyframes[index]
+    else:
         # Seek to the nearest keyframe before the target time
-        container.seek(target_pts, stream=stream, any_frame=False, backward=True)
+        index = -1
+        seek_pts = target_pts + start_pts
+
+    while True:
+        container.seek(seek_pts, stream=stream, any_frame=False, backward=True)
+        gen = decode_frames(container, stream)
+        frame = next(gen, None)
+        if frame is None or frame.pts is None or frame.pts <= target_pts or seek_pts <= 0:
+            break
+        # Some demuxers (eg: MPEG-TS) land on the keyframe after the one asked for; back off
+        # a keyframe (or a second without an index) until the target isn't skipped.
+        index -= 1
+        if keyframes and index >= 0:
+            seek_pts = keyframes[index]
+        else:
+            seek_pts = max(0, seek_pts - int(1 / stream.time_base))
+
+    # Decode frames until you reach the exact target time
+    while frame is not None:
+        if frame.pts is not None and frame.pts >= target_pts:
+            return frame, gen
+        frame = next(gen, None)
+    return None, gen
+
 
-        # Decode frames until you reach the exact target time
-        for frame in container.decode(stream):
-            if frame.pts is not None and frame.time >= target_time:
-                return frame
+def seek_to_time(container, stream, target_time, keyframes: list[int] | None = None):
+    try:
+        frame, _ = seek_decode(container, stream, target_time, keyframes)
+        return frame
     except:
         print("Seek failed")
     return None
 
+def negotiate_decode_format(pix_fmt: av.VideoFormat) -> Optional[str]:
+    """
+    Pixel format to convert a stream's frames to on the decode worker, or None when the
+    renderer can upload the decoder's own planes as they are.
+    """
+    name = pix_fmt.name
+    if name in UPLOAD_PIXEL_FORMATS or ("gbr" in name and "pf32" in name):
+        return None
+    if name.startswith("gray"):
+        return "gray"
+    if pix_fmt.is_rgb:
+        return "rgba"
+    return "yuv420p"
+
+
+def decode_scaled_size(
+    width: int, height: int, decode_size: Optional[tuple[int, int]]
+) -> Optional[tuple[int, int]]:
+    # Fit inside decode_size, never upscaling. The texture is stretched over the same UV
+    # range whatever its size, so rounding the width doesn't change the picture's aspect.
+    if not decode_size or width <= 0 or height <= 0:
+        return None
+    scale = min(decode_size[0] / width, decode_size[1] / height)
+    if scale >= 1.0:
+        return None
+    scaled_width = -(-int(width * scale) // DECODE_WIDTH_ALIGN) * DECODE_WIDTH_ALIGN
+    scaled_height = (int(np.ceil(height * scale)) + 1) & ~1
+    if scaled_width >= width:
+        return None
+    return scaled_width, min(height, scaled_height)
+
+
 def load_exr_still(path: str, video_data: VideoData):
     image = read_exr_rgba(path)
 
@@ -179,8 +1130,14 @@ def load_exr_still(path: str, video_data: VideoData):
 
 
 def load_pyp_still(path: str, video_data: VideoData):
-    image = read_pyp_image(path)
-    channels = image.pixels.shape[2] if image.pixels.ndim == 3 else 1
+    image = map_pyp_image(path, video_data.target_size)
+    if image.level > 0:
+        print(f"[PYP] Using level {image.level} ({image.width}x{image.height}) for {path}")
+    if image.pixels.ndim == 3:
+        channels = image.pixels.shape[2]
+    else:
+        # Packed one-uint32-per-pixel types
+        channels = 3 if image.data_type == PYP_DTYPE_R11G11B10F else 4
 
     video_data.container = None
     video_data.video_stream = None
@@ -190,10 +1147,16 @@ def load_pyp_still(path: str, video_data: VideoData):
     video_data.frame_pix_format = VideoFrameFormat.RGB
     video_data.colour_space = VideoFrameColourSpace.RGB
     video_data.still = True
-    video_data.hdr_still = True
-    video_data.hdr_half_still = True
+    # hdr_still means the texture samples as linear light, which sRGB textures do too.
+    video_data.hdr_still = image.data_type in (
+        PYP_DTYPE_FLOAT16,
+        PYP_DTYPE_SRGB8_A8,
+        PYP_DTYPE_R11G11B10F,
+    )
+    video_data.hdr_half_still = image.data_type == PYP_DTYPE_FLOAT16
     video_data.rgba_still = channels == 4
-    video_data.current_frame = image.pixels
+    video_data.pyp_data_type = 0 if image.data_type == PYP_DTYPE_FLOAT16 else image.data_type
+    video_data.current_frame = prefault_pixels(image.pixels)
     video_data.content_bounds_uv = image.content_bounds_uv
     video_data.status = VideoStatus.LOADED
 
@@ -220,19 +1183,145 @@ def load_rgba_still(path: str, video_data: VideoData):
     video_data.status = VideoStatus.LOADED
 
 
-def load_video(path, video_data=VideoData()):
+def load_disk_cached_still(path: str, video_data: VideoData, kind: str):
+    # The mapped pixels replace a decode, so keep the flags the decoder would have set.
+    load_pyp_still(path, video_data)
+    video_data.hdr_still = kind == "exr"
+    video_data.hdr_half_still = kind == "exr"
+    video_data.rgba_still = kind == "image"
+    video_data.pyp_data_type = 0
+
+
+def load_image_sequence(path: str, video_data: VideoData):
+    frames = find_sequence_frames(path)
+    if not frames:
+        raise ValueError(f"No frames found for image sequence {path}")
+    suffix = Path(frames[0]).suffix.lower()
+    still_loader = {".pyp": load_pyp_still, ".exr": load_exr_still}.get(suffix, load_rgba_still)
+
+    sequence = ImageSequence(
+        frames,
+        lambda frame_path: read_sequence_frame(frame_path, video_data.target_size),
+        clock=video_data.presentation_clock,
+    )
+    start_index = sequence.index_at(video_data.seek_start_seconds)
+    # The still loader sets the texture format flags, and its pixels are the start frame.
+    still_loader(frames[start_index], video_data)
+    start_frame = SequenceFrame(start_index, sequence.stream.time_base, video_data.current_frame)
+    sequence.seek(start_index + 1)
+
+    video_data.container = sequence
+    video_data.video_stream = sequence.stream
+    video_data.gen = sequence.decode()
+    video_data.still = False
+    video_data.source_path = path
+    video_data.start_frame = start_frame
+    video_data.start_frame_seconds = video_data.seek_start_seconds
+    video_data.current_frame = start_frame
+    # Bounds of one frame say nothing about the rest.
+    video_data.content_bounds_uv = (0.0, 0.0, 1.0, 1.0)
+    video_data.matte_bounds_uv = (0.0, 0.0, 1.0, 1.0)
+    video_data.start_decoder()
+    video_data.status = VideoStatus.LOADED
+    print(
+        f"[Sequence] frames={len(frames)} fps={float(sequence.stream.average_rate):.3g} "
+        f"start={start_index} path={path}"
+    )
+
+
+def load_cached_still(path: str, video_data: VideoData, kind: str, loader) -> str:
+    # Returns where the still came from: "cached" (RAM), "disk" (decoded-media cache) or "".
+    key = media_file_key(path)
+    if key is not None and video_data.target_size and kind == "pyp":
+        # Different target sizes can pick different stored levels of the same file.
+        key = key + tuple(video_data.target_size)
+    entry = still_cache.acquire(key)
+    source = "cached" if entry is not None else ""
+    if entry is None:
+        disk_path = disk_still_cache.lookup(key) if kind != "pyp" else None
+        if disk_path is not None:
+            try:
+                load_disk_cached_still(str(disk_path), video_data, kind)
+                source = "disk"
+            except Exception as e:
+                print(f"[DiskCache] Ignoring unreadable {disk_path}: {e}")
+        if source != "disk":
+            loader(path, video_data)
+            if kind != "pyp":
+                disk_still_cache.store(
+                    key,
+                    video_data.current_frame,
+                    video_data.content_bounds_uv,
+                    "float16" if kind == "exr" else "rgba8",
+                )
+        if key is None:
+            return source
+        entry = still_cache.insert(
+            CachedStill(
+                key,
+                kind,
+                video_data.width,
+                video_data.height,
+                video_data.current_frame,
+                video_data.content_bounds_uv,
+                {
+                    "hdr_still": video_data.hdr_still,
+                    "hdr_half_still": video_data.hdr_half_still,
+                    "rgba_still": video_data.rgba_still,
+                    "pyp_data_type": video_data.pyp_data_type,
+                },
+            )
+        )
+
+    video_data.container = None
+    video_data.video_stream = None
+    video_data.gen = None
+    video_data.width = entry.width
+    video_data.height = entry.height
+    video_data.frame_pix_format = VideoFrameFormat.RGB
+    video_data.colour_space = VideoFrameColourSpace.RGB
+    video_data.still = True
+    video_data.hdr_still = entry.flags["hdr_still"]
+    video_data.hdr_half_still = entry.flags["hdr_half_still"]
+    video_data.rgba_still = entry.flags["rgba_still"]
+    video_data.pyp_data_type = entry.flags["pyp_data_type"]
+    video_data.current_frame = entry.pixels
+    video_data.content_bounds_uv = entry.content_bounds_uv
+    video_data.matte_bounds_uv = entry.content_bounds_uv
+    video_data.cache_entry = entry
+    video_data.status = VideoStatus.LOADED
+    return source
+
+
+def open_video_container(path: str) -> InputContainer:
+    hwaccel = av.codec.hwaccel.HWAccel("drm", allow_software_fallback=True)
+    return av.open(path, hwaccel=hwaccel)
+
+
+def load_video(path, video_data=VideoData(), pool: Optional[MediaLoaderPool] = None):
     print(f"Load video: {path}")
     load_start = time.perf_counter()
+    # Only a video stream's decoder is deferred; stills and image sequences load as before.
+    defer_decoder = video_data.defer_decoder
+    video_data.defer_decoder = False
 
     try:
+        if is_image_sequence(path):
+            load_image_sequence(path, video_data)
+            _print_load_metric(path, time.perf_counter() - load_start, video_data, "sequence")
+            return video_data
         if path.lower().endswith(".pyp"):
-            load_pyp_still(path, video_data)
-            _print_load_metric(path, time.perf_counter() - load_start, video_data, "pyp")
+            source = load_cached_still(path, video_data, "pyp", load_pyp_still)
+            _print_load_metric(
+                path, time.perf_counter() - load_start, video_data, f"pyp-{source}" if source else "pyp"
+            )
             return video_data
         if path.lower().endswith(".exr"):
             try:
-                load_exr_still(path, video_data)
-                _print_load_metric(path, time.perf_counter() - load_start, video_data, "exr")
+                source = load_cached_still(path, video_data, "exr", load_exr_still)
+                _print_load_metric(
+                    path, time.perf_counter() - load_start, video_data, f"exr-{source}" if source else "exr"
+                )
                 return video_data
             except Exception as exr_error:
                 print(f"[EXR] Falling back to PyAV for {path}: {exr_error}")
@@ -240,49 +1329,75 @@ def load_video(path, video_data=VideoData()):
                 frame_pix_format = VideoFrameFormat.RGB
                 still = True
         elif path.lower().endswith((".png", ".jpg", ".jpeg")):
-            load_rgba_still(path, video_data)
-            _print_load_metric(path, time.perf_counter() - load_start, video_data, "image")
+            source = load_cached_still(path, video_data, "image", load_rgba_still)
+            _print_load_metric(
+                path, time.perf_counter() - load_start, video_data, f"image-{source}" if source else "image"
+            )
             return video_data
         elif path.lower().endswith((".jpg", ".jpeg", ".png")):
             container = av.open(path, format="image2")
             frame_pix_format = VideoFrameFormat.RGB
             still = True
         else:
-            hwaccel = av.codec.hwaccel.HWAccel("drm", allow_software_fallback=True)
-            container = av.open(path, hwaccel=hwaccel)
+            container = open_video_container(path)
             # Default to NV12 then adjust if needed.
             frame_pix_format = VideoFrameFormat.NV12
             still = False
 
         video_stream = container.streams.video[0]
         colour_space = VideoFrameColourSpace.RGB
+        video_data.scaled_size = None if still else decode_scaled_size(
+            video_stream.width, video_stream.height, video_data.decode_size
+        )
+        # Stills are converted by the renderer, if at all; they're only uploaded once.
+        video_data.decode_format = None if still else negotiate_decode_format(video_stream.format)
+        video_format = (
+            av.VideoFormat(video_data.decode_format)
+            if video_data.decode_format
+            else video_stream.format
+        )
 
-        if video_stream.format.is_rgb:
+        if video_format.is_rgb:
             frame_pix_format = VideoFrameFormat.RGB
             colour_space = VideoFrameColourSpace.RGB
-        elif video_stream.format.name == "gray":
+        elif video_format.name == "gray":
             frame_pix_format = VideoFrameFormat.GRAY
-        elif "gbr" in video_stream.format.name and "pf32" in video_stream.format.name:
+        elif "gbr" in video_format.name and "pf32" in video_format.name:
             frame_pix_format = VideoFrameFormat.RGB
             colour_space = VideoFrameColourSpace.RGB
-        elif video_stream.format.name == "yuv420p":
+        elif video_format.name == "yuv420p":
             colour_space = VideoFrameColourSpace.BT601
-        elif video_stream.format.name == "yuvj420p":
+        elif video_format.name == "yuvj420p":
             frame_pix_format = VideoFrameFormat.YUVJ420p
             colour_space = VideoFrameColourSpace.BT709
 
-        gen = container.decode(video=0)
+        gen = decode_frames(container, video_stream)
+        if not still:
+            get_keyframe_index_async(path, pool)
 
         video_data.container = container
         video_data.video_stream = video_stream
         video_data.gen = gen
-        video_data.width = video_stream.width
-        video_data.height = video_stream.height
+        if not still:
+            video_data.defer_decoder = defer_decoder
+            if not defer_decoder:
+                video_data.open_decoder()
+        video_data.width, video_data.height = video_data.scaled_size or (
+            video_stream.width,
+            video_stream.height,
+        )
         video_data.frame_pix_format = frame_pix_format
         video_data.colour_space = colour_space
         video_data.still = still
+        video_data.source_path = path
         video_data.current_frame = video_data.seek_start()
         video_data.content_bounds_uv = (0.0, 0.0, 1.0, 1.0)
+        video_data.matte_bounds_uv = (0.0, 0.0, 1.0, 1.0)
+        if not still and video_data.packed_matte is None:
+            # Bounds of a packed frame would cover both halves, not the picture.
+            get_video_bounds_async(path, video_data, pool)
+        if not video_data.defer_decoder:
+            video_data.start_decoder()
 
         video_data.status = VideoStatus.LOADED
         media_kind = "still-av" if still else "video"
@@ -294,13 +1409,33 @@ def load_video(path, video_data=VideoData()):
 
 
 class VideoHandler:
-    def __init__(self):
+    def __init__(
+        self,
+        loader_workers: int = LOADER_WORKERS,
+        target_size: Optional[tuple[int, int]] = None,
+    ):
+        self.target_size = target_size
         self.current_index = 0
         self.video = []
         self.video.append(VideoData())
         self.video.append(VideoData())
+        self.loader_pool = MediaLoaderPool(self._load_video, loader_workers)
+
+    def _load_video(self, path, video_data):
+        # Keyframe indexing and bounds probes queue on the same pool, behind media loads.
+        return load_video(path, video_data, self.loader_pool)
 
-    def load_video_async(self, path, video_data):
+    def load_video_async(
+        self,
+        path,
+        video_data,
+        priority: LoadPriority = LoadPriority.SHOW,
+        decode_size: Optional[tuple[int, int]] = None,
+    ) -> LoadJob:
         video_data.status = VideoStatus.LOADING
-        thread = threading.Thread(target=load_video, args=(path, video_data))
-        thread.start()
+        video_data.target_size = self.target_size
+        video_data.decode_size = decode_size
+        video_data.defer_decoder = priority != LoadPriority.SHOW
+        job = self.loader_pool.submit(path, video_data, priority)
+        video_data.load_job = job
+        return job